@@ -31,6 +31,16 @@ kubectl apply -f secrets.yaml
 kubectl apply -f postgres-deployment.yaml
 kubectl apply -f redis-deployment.yaml
 kubectl apply -f rabbitmq-deployment.yaml
+
+# Schema migrations run once, before the ingestion pods start
+echo "Running database migrations..."
+kubectl wait --for=condition=available --timeout=300s \
+    deployment/postgres -n aec-data
+kubectl delete job data-ingestion-migrate -n aec-data --ignore-not-found
+kubectl apply -f data-ingestion-migrate-job.yaml
+kubectl wait --for=condition=complete --timeout=300s \
+    job/data-ingestion-migrate -n aec-data
+
 kubectl apply -f data-ingestion-deployment.yaml
 kubectl apply -f data-processing-deployment.yaml
 kubectl apply -f data-api-deployment.yaml
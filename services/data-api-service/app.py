@@ -6,6 +6,8 @@ Flask-based REST API for data retrieval with caching and rate limiting
 import os
 import json
 import logging
+import threading
+import time
 from datetime import datetime
 from functools import wraps
 
@@ -14,10 +16,10 @@ from flask import Flask, jsonify, request, g
 from flask_cors import CORS
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
-from prometheus_client import Counter, Histogram, generate_latest
+from prometheus_client import Counter, Gauge, Histogram, generate_latest
 from pythonjsonlogger import jsonlogger
 import psycopg2
-from psycopg2.extras import RealDictCursor
+from psycopg2.extras import RealDictCursor, execute_values
 
 # Configure structured logging
 logHandler = logging.StreamHandler()
@@ -38,17 +40,35 @@ app.config['DATABASE_URL'] = os.getenv(
 )
 app.config['REDIS_URL'] = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
 app.config['CACHE_TTL'] = int(os.getenv('CACHE_TTL', 300))  # 5 minutes
-
-# Initialize Redis
-redis_client = redis.from_url(app.config['REDIS_URL'])
-
-# Initialize rate limiter
-limiter = Limiter(
-    app=app,
-    key_func=get_remote_address,
-    storage_uri=app.config['REDIS_URL'],
-    default_limits=["200 per day", "50 per hour"]
-)
+# Short TTL for cached 404s, so a newly created resource shows up quickly
+app.config['NEGATIVE_CACHE_TTL'] = int(os.getenv('NEGATIVE_CACHE_TTL', 30))
+# Minimum seconds between refreshes of the file id high-water mark
+app.config['FILE_ID_INDEX_REFRESH'] = float(os.getenv('FILE_ID_INDEX_REFRESH', 5))
+
+# Redis pool: bounded, blocking, with short socket timeouts so a slow Redis
+# costs a request at most a few hundred ms before falling through to Postgres.
+app.config['REDIS_MAX_CONNECTIONS'] = int(os.getenv('REDIS_MAX_CONNECTIONS', 20))
+app.config['REDIS_POOL_TIMEOUT'] = float(os.getenv('REDIS_POOL_TIMEOUT', 0.1))
+app.config['REDIS_SOCKET_TIMEOUT'] = float(os.getenv('REDIS_SOCKET_TIMEOUT', 0.25))
+app.config['REDIS_CONNECT_TIMEOUT'] = float(os.getenv('REDIS_CONNECT_TIMEOUT', 0.25))
+
+# Circuit breaker: after this many consecutive Redis failures the cache is
+# skipped entirely for the cooldown period.
+app.config['REDIS_BREAKER_THRESHOLD'] = int(os.getenv('REDIS_BREAKER_THRESHOLD', 5))
+app.config['REDIS_BREAKER_COOLDOWN'] = float(os.getenv('REDIS_BREAKER_COOLDOWN', 30))
+
+# Per-file access stats are buffered in these Redis hashes (file id -> hits /
+# last access epoch) and flushed to Postgres by `flask flush-access-stats`.
+ACCESS_COUNTS_KEY = 'access:counts'
+ACCESS_LAST_KEY = 'access:last'
+
+# Largest committed file id, published by data-ingestion-service (see its
+# app/api_cache.py). A sorted set with a single member 'max', so writers can
+# raise it atomically with ZADD GT.
+FILE_ID_HIGH_WATER_KEY = 'file_ids:high_water'
+
+# Redis client, created lazily by get_redis_client()
+redis_client = None
 
 # Prometheus metrics
 api_requests = Counter(
@@ -63,6 +83,153 @@ request_duration = Histogram(
 )
 cache_hits = Counter('cache_hits_total', 'Total cache hits')
 cache_misses = Counter('cache_misses_total', 'Total cache misses')
+access_stats_flushed = Counter(
+    'access_stats_flushed_total',
+    'Files whose access stats were flushed to Postgres'
+)
+negative_cache_hits = Counter(
+    'negative_cache_hits_total',
+    'Cache hits for cached 404 responses'
+)
+file_id_rejections = Counter(
+    'file_id_index_rejections_total',
+    'File lookups rejected by the in-memory file id index'
+)
+cache_bypassed = Counter(
+    'cache_bypassed_total',
+    'Cache operations skipped because the Redis circuit breaker was open'
+)
+redis_breaker_state = Gauge(
+    'redis_circuit_breaker_state',
+    'Redis circuit breaker state (0=closed, 1=open, 2=half-open)'
+)
+redis_breaker_opened = Counter(
+    'redis_circuit_breaker_opened_total',
+    'Times the Redis circuit breaker has opened'
+)
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker.
+
+    Closed: calls go through. After `threshold` consecutive failures it opens
+    and rejects calls for `cooldown` seconds, then lets a single trial call
+    through (half-open); that call's outcome closes or re-opens it.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = 0, 1, 2
+
+    def __init__(self, threshold, cooldown, clock=time.monotonic):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.clock = clock
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def _set_state(self, state):
+        self.state = state
+        redis_breaker_state.set(state)
+
+    def allow(self):
+        """Whether a call may be attempted now"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and self.clock() - self.opened_at >= self.cooldown:
+                self._set_state(self.HALF_OPEN)
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            if self.state != self.CLOSED:
+                self._set_state(self.CLOSED)
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.threshold:
+                if self.state != self.OPEN:
+                    redis_breaker_opened.inc()
+                self.opened_at = self.clock()
+                self._set_state(self.OPEN)
+
+
+redis_breaker = CircuitBreaker(
+    app.config['REDIS_BREAKER_THRESHOLD'],
+    app.config['REDIS_BREAKER_COOLDOWN']
+)
+
+# Initialize rate limiter. The limits Redis storage does not connect until
+# the first rate-limited request, so binding it here costs no network I/O.
+# It uses the same socket timeouts as the cache. If Redis is unreachable the
+# same limits are enforced per pod from in-memory storage until it recovers,
+# so a Redis outage neither fails requests nor lifts rate limiting.
+limiter = Limiter(
+    key_func=get_remote_address,
+    storage_uri=app.config['REDIS_URL'],
+    storage_options={
+        'socket_timeout': app.config['REDIS_SOCKET_TIMEOUT'],
+        'socket_connect_timeout': app.config['REDIS_CONNECT_TIMEOUT']
+    },
+    in_memory_fallback_enabled=True,
+    swallow_errors=True,
+    default_limits=["200 per day", "50 per hour"]
+)
+limiter.init_app(app)
+
+
+def get_redis_client():
+    """Get the shared Redis client, creating it on first use"""
+    global redis_client
+    if redis_client is None:
+        pool = redis.BlockingConnectionPool.from_url(
+            app.config['REDIS_URL'],
+            max_connections=app.config['REDIS_MAX_CONNECTIONS'],
+            timeout=app.config['REDIS_POOL_TIMEOUT'],
+            socket_timeout=app.config['REDIS_SOCKET_TIMEOUT'],
+            socket_connect_timeout=app.config['REDIS_CONNECT_TIMEOUT']
+        )
+        redis_client = redis.Redis(connection_pool=pool)
+    return redis_client
+
+
+def cache_call(operation, fn):
+    """Run fn(redis_client) through the circuit breaker.
+
+    Returns fn's result, or None if the breaker is open or the call failed;
+    callers treat None as a cache miss.
+    """
+    if not redis_breaker.allow():
+        cache_bypassed.inc()
+        return None
+    try:
+        result = fn(get_redis_client())
+    except Exception as e:
+        redis_breaker.record_failure()
+        logger.warning(f"Cache {operation} error: {e}")
+        return None
+    redis_breaker.record_success()
+    return result
+
+
+def cache_key(name, full_path, prefix='cache'):
+    """Cache key for a view and its request path (query string included)"""
+    return f"{prefix}:{name}:{full_path.rstrip('?')}"
+
+
+def cache_set_many(items, ttl):
+    """Store several (key, value) pairs in one pipelined round trip"""
+    def _set(r):
+        pipe = r.pipeline(transaction=False)
+        for key, value in items:
+            pipe.setex(key, ttl, app.json.dumps(value))
+        return pipe.execute()
+    if items:
+        cache_call('set', _set)
 
 
 def get_db_connection():
@@ -83,44 +250,223 @@ def close_db(error):
         db.close()
 
 
+class FileIdIndex:
+    """In-memory high-water mark of file_metadata ids.
+
+    Ids are SERIAL, so no file can have an id above the largest committed
+    one. The mark is raised from two sources: the mark ingestion publishes
+    in Redis after each commit (FILE_ID_HIGH_WATER_KEY), read on every
+    lookup above the local mark, and a MAX(id) query, run at most once per
+    `refresh_interval`. A lookup is rejected, without touching the cache,
+    only when a MAX(id) read made during that lookup is below it; above a
+    throttled mark the id may have just committed, so the lookup falls
+    through to the (negative) cache and database instead. Ids at or below
+    the mark are never rejected: SERIAL values can commit out of order, so
+    a gap below the mark may still be filled.
+    """
+
+    def __init__(self, refresh_interval, clock=time.monotonic):
+        self.refresh_interval = refresh_interval
+        self.clock = clock
+        self.high_water = 0
+        self.last_refresh = None
+        self._lock = threading.Lock()
+
+    def raise_to(self, file_id):
+        with self._lock:
+            self.high_water = max(self.high_water, file_id)
+
+    def refresh(self, connect):
+        """Re-read the largest committed id, using connect() for the DB.
+
+        Returns:
+            False if skipped because the last refresh was too recent
+        """
+        with self._lock:
+            now = self.clock()
+            if self.last_refresh is not None and now - self.last_refresh < self.refresh_interval:
+                return False
+            self.last_refresh = now
+            cursor = connect().cursor()
+            cursor.execute('SELECT MAX(id) AS max_id FROM file_metadata')
+            row = cursor.fetchone()
+            cursor.close()
+            self.high_water = max(self.high_water, (row and row['max_id']) or 0)
+            return True
+
+    def might_exist(self, file_id):
+        """False only if file_id is known not to exist"""
+        if file_id <= 0:
+            return False
+        if file_id <= self.high_water:
+            return True
+
+        published = cache_call(
+            'get', lambda r: r.zscore(FILE_ID_HIGH_WATER_KEY, 'max')
+        )
+        if published:
+            self.raise_to(int(published))
+            if file_id <= self.high_water:
+                return True
+
+        try:
+            refreshed = self.refresh(get_db_connection)
+        except Exception as e:
+            logger.warning(f"File id index refresh failed: {e}")
+            return True
+        return not refreshed or file_id <= self.high_water
+
+
+file_id_index = FileIdIndex(app.config['FILE_ID_INDEX_REFRESH'])
+
+
+def _status_code(result):
+    """Status code of a view return value (Response, tuple or cached dict)"""
+    if isinstance(result, tuple):
+        return result[1]
+    return getattr(result, 'status_code', 200)
+
+
 def cache_result(timeout=None):
-    """Decorator to cache function results in Redis"""
+    """Decorator to cache function results in Redis.
+
+    200 responses are cached for `timeout`; 404s are cached under a separate
+    key for NEGATIVE_CACHE_TTL so repeated probes for missing resources do
+    not reach Postgres. Both keys are read in a single MGET.
+    """
     def decorator(f):
         @wraps(f)
         def decorated_function(*args, **kwargs):
             # Create cache key from function name and arguments
-            cache_key = f"cache:{f.__name__}:{request.full_path}"
+            key = cache_key(f.__name__, request.full_path)
+            not_found_key = cache_key(f.__name__, request.full_path, prefix='notfound')
             
             # Try to get from cache
-            try:
-                cached = redis_client.get(cache_key)
-                if cached:
+            cached = cache_call('get', lambda r: r.mget(key, not_found_key))
+            if cached:
+                hit, not_found = cached
+                if hit:
                     cache_hits.inc()
-                    logger.info(f"Cache hit for {cache_key}")
-                    return json.loads(cached)
-            except Exception as e:
-                logger.warning(f"Cache get error: {e}")
+                    logger.info(f"Cache hit for {key}")
+                    return json.loads(hit)
+                if not_found:
+                    negative_cache_hits.inc()
+                    return json.loads(not_found), 404
             
             # Cache miss - execute function
             cache_misses.inc()
             result = f(*args, **kwargs)
             
-            # Store in cache
-            try:
+            # Store successful and not-found responses in cache
+            status_code = _status_code(result)
+            if status_code == 200:
                 ttl = timeout or app.config['CACHE_TTL']
-                redis_client.setex(
-                    cache_key,
-                    ttl,
-                    json.dumps(result)
+                cache_set_many([(key, result.get_json())], ttl)
+            elif status_code == 404:
+                cache_set_many(
+                    [(not_found_key, result[0].get_json())],
+                    app.config['NEGATIVE_CACHE_TTL']
                 )
-            except Exception as e:
-                logger.warning(f"Cache set error: {e}")
             
             return result
         return decorated_function
     return decorator
 
 
+def reject_unknown_file_ids(f):
+    """Decorator answering 404 for file ids the file id index rules out.
+
+    Must wrap cache_result so that such lookups skip Redis too.
+    """
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        if not file_id_index.might_exist(kwargs['file_id']):
+            file_id_rejections.inc()
+            return jsonify({'error': 'File not found'}), 404
+        return f(*args, **kwargs)
+    return decorated_function
+
+
+def track_access(f):
+    """Decorator recording a read of the file given by the file_id argument.
+
+    Counts are buffered in Redis (one pipelined round trip, no Postgres
+    write) and cache hits are counted too, so it must wrap cache_result.
+    """
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        result = f(*args, **kwargs)
+        if _status_code(result) < 400:
+            file_id = kwargs['file_id']
+
+            def _record(r):
+                pipe = r.pipeline(transaction=False)
+                pipe.hincrby(ACCESS_COUNTS_KEY, file_id, 1)
+                pipe.hset(ACCESS_LAST_KEY, file_id, time.time())
+                return pipe.execute()
+            cache_call('access stats', _record)
+        return result
+    return decorated_function
+
+
+def flush_access_stats():
+    """Move buffered access stats from Redis into file_metadata.
+
+    Returns:
+        Number of files updated
+    """
+    r = get_redis_client()
+    # Take the pending batch atomically; reads after this start a new one.
+    pipe = r.pipeline(transaction=True)
+    pipe.hgetall(ACCESS_COUNTS_KEY)
+    pipe.hgetall(ACCESS_LAST_KEY)
+    pipe.delete(ACCESS_COUNTS_KEY, ACCESS_LAST_KEY)
+    counts, last, _ = pipe.execute()
+    if not counts:
+        return 0
+
+    rows = [
+        (
+            int(file_id),
+            int(hits),
+            datetime.utcfromtimestamp(float(last[file_id])) if file_id in last else None
+        )
+        for file_id, hits in counts.items()
+    ]
+
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        execute_values(cursor, '''
+            UPDATE file_metadata AS f
+            SET access_count = f.access_count + v.hits,
+                last_accessed_at = GREATEST(f.last_accessed_at, v.last_access)
+            FROM (VALUES %s) AS v(id, hits, last_access)
+            WHERE f.id = v.id
+        ''', rows, template='(%s::integer, %s::bigint, %s::timestamp)')
+        conn.commit()
+        cursor.close()
+    except Exception:
+        # Put the counts back so the next flush retries them.
+        pipe = r.pipeline(transaction=False)
+        for file_id, hits in counts.items():
+            pipe.hincrby(ACCESS_COUNTS_KEY, file_id, int(hits))
+        for file_id, ts in last.items():
+            pipe.hsetnx(ACCESS_LAST_KEY, file_id, ts)
+        pipe.execute()
+        raise
+
+    access_stats_flushed.inc(len(rows))
+    logger.info(f"Flushed access stats for {len(rows)} files")
+    return len(rows)
+
+
+@app.cli.command('flush-access-stats')
+def flush_access_stats_command():
+    """Flush buffered access stats to Postgres (run from a CronJob)"""
+    flush_access_stats()
+
+
 @app.before_request
 def before_request():
     """Track request metrics"""
@@ -169,7 +515,7 @@ def readiness_check():
         cursor.close()
         
         # Check Redis
-        redis_client.ping()
+        get_redis_client().ping()
         
         return jsonify({
             'status': 'ready',
@@ -186,6 +532,8 @@ def readiness_check():
 
 @app.route('/api/v1/files/<int:file_id>', methods=['GET'])
 @limiter.limit("100 per minute")
+@track_access
+@reject_unknown_file_ids
 @cache_result(timeout=300)
 def get_file(file_id):
     """Get file metadata by ID"""
@@ -263,6 +611,12 @@ def list_files():
                 file_dict['upload_timestamp'] = file_dict['upload_timestamp'].isoformat()
             results.append(file_dict)
         
+        # Prime the get_file cache for every listed file in one round trip
+        cache_set_many(
+            [(cache_key('get_file', f"/api/v1/files/{f['id']}"), f) for f in results],
+            app.config['CACHE_TTL']
+        )
+        
         return jsonify({
             'files': results,
             'pagination': {
@@ -321,6 +675,7 @@ def get_project_stats(project_id):
 
 
 @app.route('/metrics', methods=['GET'])
+@limiter.exempt
 def metrics():
     """Prometheus metrics endpoint"""
     return generate_latest(), 200, {'Content-Type': 'text/plain; charset=utf-8'}
@@ -0,0 +1,72 @@
+import importlib
+
+import pytest
+
+
+def _b(value):
+    return value if isinstance(value, bytes) else str(value).encode()
+
+
+class _FakeRedis:
+    """Just enough of redis-py for the cache and access-stats paths"""
+
+    def __init__(self):
+        self.hashes = {}
+        self.values = {}
+        self.zsets = {}
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def mget(self, *keys):
+        return [self.values.get(key) for key in keys]
+
+    def setex(self, key, ttl, value):
+        self.values[key] = value
+
+    def zscore(self, key, member):
+        return self.zsets.get(key, {}).get(member)
+
+    def hincrby(self, key, field, amount):
+        h = self.hashes.setdefault(key, {})
+        h[_b(field)] = _b(int(h.get(_b(field), 0)) + amount)
+
+    def hset(self, key, field, value):
+        self.hashes.setdefault(key, {})[_b(field)] = _b(value)
+
+    def hsetnx(self, key, field, value):
+        self.hashes.setdefault(key, {}).setdefault(_b(field), _b(value))
+
+    def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+    def delete(self, *keys):
+        for key in keys:
+            self.hashes.pop(key, None)
+
+    def pipeline(self, transaction=True):
+        return _FakePipeline(self)
+
+
+class _FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.calls = []
+
+    def __getattr__(self, name):
+        def queue(*args):
+            self.calls.append((name, args))
+        return queue
+
+    def execute(self):
+        return [getattr(self.redis, name)(*args) for name, args in self.calls]
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    """Install an in-memory Redis and a fresh circuit breaker on the app"""
+    app_mod = importlib.import_module("app")
+    fake = _FakeRedis()
+    monkeypatch.setattr(app_mod, "redis_client", fake)
+    monkeypatch.setattr(app_mod, "redis_breaker", app_mod.CircuitBreaker(5, 30))
+    return fake
@@ -0,0 +1,94 @@
+import importlib
+import os
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+
+class _Conn:
+    def cursor(self):
+        return self
+
+    def execute(self, sql, params=None):
+        return None
+
+    def fetchone(self):
+        return {'id': 7, 'filename': 'a.rvt'}
+
+    def close(self):
+        return None
+
+    def commit(self):
+        return None
+
+
+def test_reads_are_counted_and_flushed(monkeypatch, fake_redis):
+    app_mod = importlib.import_module("app")
+    fake = fake_redis
+    monkeypatch.setattr(app_mod.file_id_index, "might_exist", lambda file_id: True)
+    monkeypatch.setattr(app_mod, "get_db_connection", lambda: _Conn())
+    monkeypatch.setattr(app_mod.limiter, "enabled", False)
+
+    client = app_mod.app.test_client()
+    for _ in range(3):
+        assert client.get("/api/v1/files/7").status_code == 200
+
+    counts = fake.hgetall(app_mod.ACCESS_COUNTS_KEY)
+    assert counts == {b"7": b"3"}
+    assert b"7" in fake.hgetall(app_mod.ACCESS_LAST_KEY)
+
+    flushed = []
+    monkeypatch.setattr(
+        app_mod, "execute_values",
+        lambda cursor, sql, rows, template=None: flushed.extend(rows)
+    )
+    with app_mod.app.app_context():
+        assert app_mod.flush_access_stats() == 1
+    assert flushed[0][:2] == (7, 3)
+    assert fake.hgetall(app_mod.ACCESS_COUNTS_KEY) == {}
+
+
+def test_failed_flush_keeps_counts(monkeypatch, fake_redis):
+    app_mod = importlib.import_module("app")
+    fake = fake_redis
+    fake.hincrby(app_mod.ACCESS_COUNTS_KEY, 9, 4)
+    monkeypatch.setattr(app_mod, "get_db_connection", lambda: _Conn())
+
+    def _boom(*args, **kwargs):
+        raise RuntimeError("db down")
+
+    monkeypatch.setattr(app_mod, "execute_values", _boom)
+    with app_mod.app.app_context():
+        with pytest.raises(RuntimeError):
+            app_mod.flush_access_stats()
+    assert fake.hgetall(app_mod.ACCESS_COUNTS_KEY) == {b"9": b"4"}
+
+
+def test_last_access_is_utc_in_any_local_timezone(monkeypatch, fake_redis):
+    app_mod = importlib.import_module("app")
+    monkeypatch.setattr(app_mod.file_id_index, "might_exist", lambda file_id: True)
+    monkeypatch.setattr(app_mod, "get_db_connection", lambda: _Conn())
+    monkeypatch.setattr(app_mod.limiter, "enabled", False)
+    local_tz = os.environ.get("TZ")
+    os.environ["TZ"] = "America/Los_Angeles"
+    time.tzset()
+    try:
+        assert app_mod.app.test_client().get("/api/v1/files/7").status_code == 200
+
+        flushed = []
+        monkeypatch.setattr(
+            app_mod, "execute_values",
+            lambda cursor, sql, rows, template=None: flushed.extend(rows)
+        )
+        with app_mod.app.app_context():
+            app_mod.flush_access_stats()
+    finally:
+        if local_tz is None:
+            del os.environ["TZ"]
+        else:
+            os.environ["TZ"] = local_tz
+        time.tzset()
+
+    # last_accessed_at is naive UTC, like upload_timestamp
+    assert abs(flushed[0][2] - datetime.utcnow()) < timedelta(minutes=1)
@@ -0,0 +1,194 @@
+import importlib
+
+import pytest
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class _IdConn:
+    """DB stub serving `SELECT MAX(id) FROM file_metadata` over committed ids"""
+
+    def __init__(self, ids):
+        self.ids = ids
+        self.queries = 0
+
+    def cursor(self):
+        return self
+
+    def execute(self, sql, params=None):
+        self.queries += 1
+
+    def fetchone(self):
+        return {'max_id': max(self.ids, default=None)}
+
+    def close(self):
+        return None
+
+
+class _MissingFileConn:
+    """DB stub for get_file that never finds the row"""
+
+    def __init__(self):
+        self.lookups = 0
+
+    def cursor(self):
+        return self
+
+    def execute(self, sql, params=None):
+        self.lookups += 1
+
+    def fetchone(self):
+        return None
+
+    def close(self):
+        return None
+
+
+class _FileConn(_IdConn):
+    """DB stub serving MAX(id) and get_file lookups over committed ids"""
+
+    def execute(self, sql, params=None):
+        super().execute(sql, params)
+        self.params = params
+
+    def fetchone(self):
+        if self.params is None:
+            return super().fetchone()
+        file_id = self.params[0]
+        if file_id not in self.ids:
+            return None
+        return {'id': file_id, 'filename': f'{file_id}.dwg'}
+
+
+@pytest.fixture
+def app_mod(monkeypatch):
+    mod = importlib.import_module("app")
+    monkeypatch.setattr(mod.limiter, "enabled", False)
+    return mod
+
+
+def test_index_rejects_only_after_fresh_refresh(monkeypatch, app_mod, fake_redis):
+    clock = _Clock()
+    index = app_mod.FileIdIndex(refresh_interval=5, clock=clock)
+    conn = _IdConn({1, 2, 5})
+    monkeypatch.setattr(app_mod, "get_db_connection", lambda: conn)
+
+    with app_mod.app.app_context():
+        # Above the mark with a refresh due: MAX(id) is read and rules it out
+        assert not index.might_exist(6)
+        assert index.might_exist(2)
+        assert not index.might_exist(0)
+        assert conn.queries == 1
+
+        # Refreshed too recently to look again: not rejected, since 6 may
+        # have committed since; the cache/DB path decides
+        conn.ids.add(6)
+        clock.now += 1
+        assert index.might_exist(6)
+        assert conn.queries == 1
+
+        clock.now += 5
+        assert index.might_exist(6)
+        assert index.high_water == 6
+        assert conn.queries == 2
+
+
+def test_index_uses_published_high_water(monkeypatch, app_mod, fake_redis):
+    index = app_mod.FileIdIndex(refresh_interval=5, clock=_Clock())
+    conn = _IdConn({1, 2})
+    monkeypatch.setattr(app_mod, "get_db_connection", lambda: conn)
+
+    with app_mod.app.app_context():
+        assert not index.might_exist(3)
+
+        # Ingestion commits 3 and raises the shared mark
+        conn.ids.add(3)
+        fake_redis.zsets[app_mod.FILE_ID_HIGH_WATER_KEY] = {'max': 3.0}
+        assert index.might_exist(3)
+        assert conn.queries == 1
+
+
+def test_index_never_rejects_out_of_order_commits(monkeypatch, app_mod, fake_redis):
+    clock = _Clock()
+    index = app_mod.FileIdIndex(refresh_interval=5, clock=clock)
+    conn = _IdConn({1, 2, 3, 5})
+    monkeypatch.setattr(app_mod, "get_db_connection", lambda: conn)
+
+    with app_mod.app.app_context():
+        assert index.might_exist(5)
+        # 4 was allocated before 5 but commits after 5 has been seen
+        conn.ids.add(4)
+        clock.now += 5
+        assert index.might_exist(4)
+        # Gaps below the mark are left to the cache/DB path, not rejected
+        assert index.might_exist(3)
+
+
+def test_index_allows_lookups_when_unavailable(monkeypatch, app_mod, fake_redis):
+    index = app_mod.FileIdIndex(refresh_interval=5)
+
+    def _down():
+        raise RuntimeError("db down")
+
+    monkeypatch.setattr(app_mod, "get_db_connection", _down)
+    with app_mod.app.app_context():
+        assert index.might_exist(42)
+
+
+def test_unknown_id_rejected_without_cache_lookup(monkeypatch, app_mod, fake_redis):
+    monkeypatch.setattr(
+        app_mod, "file_id_index", app_mod.FileIdIndex(refresh_interval=5, clock=_Clock())
+    )
+    conn = _IdConn({1, 2})
+    monkeypatch.setattr(app_mod, "get_db_connection", lambda: conn)
+
+    def _no_cache(*keys):
+        raise AssertionError("cache should not be read")
+
+    monkeypatch.setattr(fake_redis, "mget", _no_cache)
+
+    resp = app_mod.app.test_client().get("/api/v1/files/3")
+    assert resp.status_code == 404
+    assert resp.get_json() == {'error': 'File not found'}
+    assert conn.queries == 1
+
+
+def test_file_committed_inside_refresh_window_is_served(monkeypatch, app_mod, fake_redis):
+    clock = _Clock()
+    monkeypatch.setattr(
+        app_mod, "file_id_index", app_mod.FileIdIndex(refresh_interval=5, clock=clock)
+    )
+    conn = _FileConn({1, 2, 3})
+    monkeypatch.setattr(app_mod, "get_db_connection", lambda: conn)
+    client = app_mod.app.test_client()
+
+    # A crawler probe refreshes the mark (3) and is rejected
+    assert client.get("/api/v1/files/99").status_code == 404
+
+    # A file commits a second later, well inside the refresh window
+    conn.ids.add(4)
+    clock.now += 1
+    resp = client.get("/api/v1/files/4")
+    assert resp.status_code == 200
+    assert resp.get_json()['id'] == 4
+
+
+def test_not_found_is_negatively_cached(monkeypatch, app_mod, fake_redis):
+    monkeypatch.setattr(app_mod.file_id_index, "might_exist", lambda file_id: True)
+    conn = _MissingFileConn()
+    monkeypatch.setattr(app_mod, "get_db_connection", lambda: conn)
+
+    client = app_mod.app.test_client()
+    for _ in range(3):
+        resp = client.get("/api/v1/files/404")
+        assert resp.status_code == 404
+        assert resp.get_json() == {'error': 'File not found'}
+
+    assert conn.lookups == 1
+    assert fake_redis.values.keys() == {"notfound:get_file:/api/v1/files/404"}
@@ -0,0 +1,165 @@
+import importlib
+from datetime import datetime
+
+import pytest
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class _DownRedis:
+    """Redis stub whose every call fails, counting attempts"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def get(self, key):
+        self.calls += 1
+        raise ConnectionError("redis timeout")
+
+
+@pytest.fixture
+def app_mod():
+    return importlib.import_module("app")
+
+
+def test_breaker_opens_then_half_opens(app_mod):
+    clock = _Clock()
+    breaker = app_mod.CircuitBreaker(threshold=3, cooldown=10, clock=clock)
+
+    for _ in range(3):
+        assert breaker.allow()
+        breaker.record_failure()
+    assert breaker.state == breaker.OPEN
+    assert not breaker.allow()
+
+    clock.now = 10
+    assert breaker.allow()
+    assert breaker.state == breaker.HALF_OPEN
+    # Only one trial call while half-open
+    assert not breaker.allow()
+
+    breaker.record_failure()
+    assert breaker.state == breaker.OPEN
+    clock.now = 20
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == breaker.CLOSED
+    assert breaker.allow()
+
+
+def test_success_resets_failure_count(app_mod):
+    breaker = app_mod.CircuitBreaker(threshold=2, cooldown=10, clock=_Clock())
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == breaker.CLOSED
+
+
+def test_open_breaker_skips_redis(monkeypatch, app_mod):
+    down = _DownRedis()
+    breaker = app_mod.CircuitBreaker(threshold=2, cooldown=30, clock=_Clock())
+    monkeypatch.setattr(app_mod, "redis_client", down)
+    monkeypatch.setattr(app_mod, "redis_breaker", breaker)
+
+    for _ in range(5):
+        assert app_mod.cache_call("get", lambda r: r.get("k")) is None
+
+    assert down.calls == 2
+    assert breaker.state == breaker.OPEN
+
+
+def test_breaker_state_exposed_in_metrics(app_mod):
+    body = app_mod.app.test_client().get("/metrics").get_data(as_text=True)
+    assert "redis_circuit_breaker_state" in body
+    assert "cache_bypassed_total" in body
+
+
+class _ListConn:
+    """DB stub for list_files returning two rows"""
+
+    ROWS = [
+        {'id': 11, 'filename': 'a.rvt', 'upload_timestamp': datetime(2026, 1, 2, 3, 4, 5)},
+        {'id': 12, 'filename': 'b.ifc', 'upload_timestamp': datetime(2026, 1, 3, 3, 4, 5)},
+    ]
+
+    def cursor(self):
+        return self
+
+    def execute(self, sql, params=None):
+        return None
+
+    def fetchall(self):
+        return [dict(row) for row in self.ROWS]
+
+    def fetchone(self):
+        return {'count': len(self.ROWS)}
+
+    def close(self):
+        return None
+
+
+def _open_breaker(app_mod, monkeypatch):
+    breaker = app_mod.CircuitBreaker(threshold=1, cooldown=30, clock=_Clock())
+    breaker.record_failure()
+    monkeypatch.setattr(app_mod, "redis_breaker", breaker)
+    return breaker
+
+
+def test_list_files_primes_get_file_cache(monkeypatch, app_mod, fake_redis):
+    monkeypatch.setattr(app_mod.limiter, "enabled", False)
+    monkeypatch.setattr(app_mod.file_id_index, "might_exist", lambda file_id: True)
+    monkeypatch.setattr(app_mod, "get_db_connection", lambda: _ListConn())
+    client = app_mod.app.test_client()
+
+    listed = client.get("/api/v1/files").get_json()["files"]
+
+    def _no_db():
+        raise AssertionError("get_file should be served from the primed cache")
+
+    monkeypatch.setattr(app_mod, "get_db_connection", _no_db)
+    for row in listed:
+        resp = client.get(f"/api/v1/files/{row['id']}")
+        assert resp.status_code == 200
+        assert resp.get_json() == row
+
+
+def test_open_breaker_skips_pipelined_writes(monkeypatch, app_mod, fake_redis):
+    _open_breaker(app_mod, monkeypatch)
+
+    def _no_pipeline(*args, **kwargs):
+        raise AssertionError("Redis should not be called while the breaker is open")
+
+    monkeypatch.setattr(fake_redis, "pipeline", _no_pipeline)
+    app_mod.cache_set_many([("cache:get_file:/api/v1/files/1", {"id": 1})], 60)
+    assert fake_redis.values == {}
+
+
+def test_rate_limits_enforced_in_memory_when_redis_down(monkeypatch, app_mod, fake_redis):
+    monkeypatch.setattr(app_mod, "get_db_connection", lambda: _ListConn())
+    limiter = app_mod.limiter
+
+    class _DownLimiter:
+        def __getattr__(self, name):
+            def _fail(*args, **kwargs):
+                raise ConnectionError("redis down")
+            return _fail
+
+    monkeypatch.setattr(limiter, "_limiter", _DownLimiter())
+    monkeypatch.setattr(limiter._storage, "check", lambda: False)
+    monkeypatch.setattr(limiter, "_storage_dead", False)
+    limiter._fallback_storage.reset()
+
+    client = app_mod.app.test_client()
+    statuses = [client.get("/api/v1/files").status_code for _ in range(51)]
+
+    # list_files allows 50 per minute; the 51st is rejected
+    assert statuses[:50] == [200] * 50
+    assert statuses[50] == 429
+    assert limiter._storage_dead
+    limiter._fallback_storage.reset()
@@ -0,0 +1,83 @@
+import importlib
+import json
+import os
+import socketserver
+import subprocess
+import sys
+import threading
+import time
+
+# Cold-start budget for a pod: interpreter start + import of app, and the
+# time from the first request to a successful /ready.
+IMPORT_BUDGET_SECONDS = float(os.getenv("IMPORT_BUDGET_SECONDS", "2.0"))
+READY_BUDGET_SECONDS = float(os.getenv("READY_BUDGET_SECONDS", "0.5"))
+
+SERVICE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_import_is_lazy_and_within_budget():
+    probe = (
+        "import json\n"
+        "import app\n"
+        "print(json.dumps({'redis_client': app.redis_client is not None}))\n"
+    )
+    env = dict(os.environ, PYTHONPATH=SERVICE_DIR)
+    start = time.perf_counter()
+    out = subprocess.run(
+        [sys.executable, "-c", probe],
+        cwd=SERVICE_DIR, env=env, capture_output=True, text=True, check=True,
+    )
+    elapsed = time.perf_counter() - start
+
+    state = json.loads(out.stdout.strip().splitlines()[-1])
+    assert state == {"redis_client": False}
+    assert elapsed < IMPORT_BUDGET_SECONDS, f"import took {elapsed:.2f}s"
+
+
+class _PongHandler(socketserver.BaseRequestHandler):
+    """Minimal RESP server: answers every command with +PONG"""
+
+    def handle(self):
+        while True:
+            data = self.request.recv(65536)
+            if not data:
+                return
+            commands = sum(1 for line in data.split(b"\r\n") if line.startswith(b"*"))
+            self.request.sendall(b"+PONG\r\n" * commands)
+
+
+def test_time_to_ready_within_budget(monkeypatch):
+    app_mod = importlib.import_module("app")
+
+    class _Cursor:
+        def execute(self, sql):
+            return None
+
+        def close(self):
+            return None
+
+    class _Conn:
+        def cursor(self):
+            return _Cursor()
+
+    server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), _PongHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address
+
+    monkeypatch.setattr(app_mod, "get_db_connection", lambda: _Conn())
+    # The Redis client and its pool are really built (and connected) by /ready
+    monkeypatch.setattr(app_mod, "redis_client", None)
+    monkeypatch.setitem(app_mod.app.config, "REDIS_URL", f"redis://{host}:{port}/0")
+
+    try:
+        start = time.perf_counter()
+        resp = app_mod.app.test_client().get("/ready")
+        elapsed = time.perf_counter() - start
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert resp.status_code == 200, resp.get_json()
+    assert resp.get_json()["status"] == "ready"
+    assert elapsed < READY_BUDGET_SECONDS, f"ready took {elapsed:.2f}s"
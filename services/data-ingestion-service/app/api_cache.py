@@ -0,0 +1,60 @@
+"""
+data-api cache notifications
+data-api keeps an in-memory high-water mark of file ids, used to answer 404
+for ids that cannot exist, and caches 404 responses in Redis. After new
+file_metadata rows commit, writers raise the shared mark and drop cached
+404s for the new ids, so data-api serves them immediately.
+
+Best effort: data-api also finds new ids through its own MAX(id) refresh,
+so a Redis failure here is logged and otherwise ignored.
+"""
+
+import logging
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Must match data-api's FILE_ID_HIGH_WATER_KEY: a sorted set with the single
+# member "max", raised atomically (never lowered) with ZADD GT.
+FILE_ID_HIGH_WATER_KEY = "file_ids:high_water"
+
+# Redis client, created lazily by get_redis_client()
+redis_client = None
+
+
+def get_redis_client():
+    """Return the shared client for data-api's Redis, or None if not configured"""
+    global redis_client
+    if redis_client is None and settings.REDIS_URL:
+        import redis  # only needed when REDIS_URL is set
+
+        redis_client = redis.Redis.from_url(
+            settings.REDIS_URL,
+            socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+            socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT
+        )
+    return redis_client
+
+
+def not_found_key(file_id: int) -> str:
+    """data-api's cached-404 key for GET /api/v1/files/{file_id}"""
+    return f"notfound:get_file:/api/v1/files/{file_id}"
+
+
+def publish_file_ids(max_id: int, file_ids=(), client=None):
+    """Raise data-api's file id mark to max_id and drop cached 404s for file_ids"""
+    client = client or get_redis_client()
+    if client is None or not max_id:
+        return
+    try:
+        pipe = client.pipeline(transaction=False)
+        pipe.zadd(FILE_ID_HIGH_WATER_KEY, {"max": max_id}, gt=True)
+        for file_id in file_ids:
+            pipe.delete(not_found_key(file_id))
+        pipe.execute()
+    except Exception as e:
+        logger.warning(
+            f"Publishing file ids to data-api failed: {e}",
+            extra={"max_id": max_id}
+        )
@@ -0,0 +1,431 @@
+"""
+Bulk metadata import
+Registers objects that already exist in S3 in file_metadata, for onboarding
+customers with millions of files.
+
+The keys under the prefix are split into contiguous key ranges, several per
+worker, each listed by a worker thread with paginated ListObjectsV2. Ranges
+are found by bisecting the key space with single-key listings, so flat and
+deeply nested prefixes parallelise alike. Rows are streamed into Postgres
+with COPY into a temporary staging table, then inserted with
+ON CONFLICT (s3_key) DO NOTHING, so re-imports and overlaps are skipped.
+The ranges are saved as checkpoints before any import starts, and each
+batch commits together with its range's checkpoint, so an interrupted job
+resumes over the same ranges where it stopped when re-run with the same
+--job-id. With a Redis
+URL, each batch's largest new id is published to data-api (app.api_cache)
+as soon as it commits.
+
+    python -m app.bulk_import --bucket customer-bucket --prefix projects/ \\
+        --project-id proj042 --workers 16
+"""
+
+import argparse
+import csv
+import io
+import logging
+import mimetypes
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from psycopg2.extras import execute_values
+
+from app import api_cache, database
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+STAGING_COLUMNS = (
+    "filename", "s3_key", "s3_bucket", "file_size",
+    "content_type", "project_id", "upload_timestamp"
+)
+
+
+# Ranges are even in key space, not in object count, so a few per worker
+# keep every worker busy until the end of the import.
+RANGES_PER_WORKER = 4
+
+# Single-key listings spent searching for one split point
+MAX_SPLIT_PROBES = 24
+
+# Split points are placed in printable ASCII. Keys outside it still fall in
+# exactly one range; they are just split less evenly.
+_FIRST_CHAR, _LAST_CHAR = 0x20, 0x7E
+_BASE = _LAST_CHAR - _FIRST_CHAR + 1
+
+
+def _midpoint(low: str, high: str):
+    """A string roughly halfway between low and high (low <= mid < high), or None"""
+    width = max(len(low), len(high)) + 1
+
+    def _value(key):
+        value = 0
+        for i in range(width):
+            char = ord(key[i]) if i < len(key) else _FIRST_CHAR
+            value = value * _BASE + min(max(char, _FIRST_CHAR), _LAST_CHAR) - _FIRST_CHAR
+        return value
+
+    value = (_value(low) + _value(high)) // 2
+    chars = []
+    for _ in range(width):
+        value, digit = divmod(value, _BASE)
+        chars.append(chr(digit + _FIRST_CHAR))
+    mid = "".join(reversed(chars))
+    return mid if low <= mid < high else None
+
+
+def _first_key(s3, bucket: str, prefix: str, after: str):
+    """First key under prefix that sorts after `after`, or None"""
+    kwargs = {"Bucket": bucket, "Prefix": prefix, "MaxKeys": 1}
+    if after:
+        kwargs["StartAfter"] = after
+    contents = s3.list_objects_v2(**kwargs).get("Contents", [])
+    return contents[0]["Key"] if contents else None
+
+
+def split_range(s3, bucket: str, prefix: str, start: str, end: str):
+    """Split point of the range (start, end] leaving keys on both sides, or None"""
+    first = _first_key(s3, bucket, prefix, start)
+    if first is None or (end is not None and first > end):
+        return None
+
+    def _any_after(after):
+        key = _first_key(s3, bucket, prefix, after)
+        return key is not None and (end is None or key <= end)
+
+    # Keys often share a long prefix (e.g. "projects/proj00"). Find the
+    # longest prefix of `first` that every key in the range shares, so the
+    # bisection below starts at the first character where keys differ.
+    shared, longer = len(prefix), len(first) + 1
+    if _any_after(first[:shared] + chr(_LAST_CHAR)):
+        longer = shared
+    while longer - shared > 1:
+        length = (shared + longer) // 2
+        if _any_after(first[:length] + chr(_LAST_CHAR)):
+            longer = length
+        else:
+            shared = length
+
+    high = first[:shared] + chr(_LAST_CHAR)
+    if end is not None and end < high:
+        high = end
+    for _ in range(MAX_SPLIT_PROBES):
+        mid = _midpoint(first, high)
+        if mid is None:
+            return None
+        if _any_after(mid):
+            return mid
+        high = mid  # nothing above mid: bisect the lower half
+    return None
+
+
+def list_units(s3, bucket: str, prefix: str, min_units: int = 1, workers: int = 8):
+    """Split the keys under prefix into at least min_units key ranges.
+
+    Each round splits every range found so far, in parallel; fewer ranges
+    are returned if there are too few objects to split further.
+
+    Returns:
+        Sorted (start, end) pairs tiling every key under prefix; a range
+        holds the keys after start ("" = from the first key) up to and
+        including end (None = to the last key).
+    """
+    boundaries = []
+    splittable = [("", None)]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        while splittable and len(boundaries) + 1 < min_units:
+            mids = pool.map(
+                lambda unit: split_range(s3, bucket, prefix, *unit), splittable
+            )
+            next_round = []
+            for (start, end), mid in zip(splittable, list(mids)):
+                if mid is not None:
+                    boundaries.append(mid)
+                    next_round += [(start, mid), (mid, end)]
+            splittable = next_round
+    boundaries.sort()
+    return list(zip([""] + boundaries, boundaries + [None]))
+
+
+def scan_unit(s3, bucket: str, prefix: str, start: str, end: str,
+              start_after: str = None, page_size: int = 1000):
+    """Yield pages of S3 objects in the range (start, end], in key order"""
+    kwargs = {"Bucket": bucket, "Prefix": prefix, "MaxKeys": page_size}
+    start_after = start_after or start
+    if start_after:
+        kwargs["StartAfter"] = start_after
+    paginator = s3.get_paginator("list_objects_v2")
+    for page in paginator.paginate(**kwargs):
+        contents = page.get("Contents", [])
+        if end is not None and contents and contents[-1]["Key"] > end:
+            contents = [obj for obj in contents if obj["Key"] <= end]
+            if contents:
+                yield contents
+            return
+        if contents:
+            yield contents
+
+
+def object_row(obj: dict, bucket: str, project_id: str):
+    """file_metadata row for an S3 object, or None if it should be skipped"""
+    key = obj["Key"]
+    filename = key.rsplit("/", 1)[-1]
+    if not filename:
+        return None  # "directory" marker
+    if os.path.splitext(filename)[1].lower() not in settings.ALLOWED_EXTENSIONS:
+        return None
+    content_type = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+    last_modified = obj["LastModified"].replace(tzinfo=None)
+    return (
+        filename, key, bucket, obj["Size"],
+        content_type, project_id, last_modified.isoformat()
+    )
+
+
+class PostgresSink:
+    """Writes batches with COPY and tracks per-range checkpoints.
+
+    Each worker holds one connection for the whole of its range, so the
+    sink gets its own pool of `workers` connections and run_import never
+    starts more workers than that (max_workers).
+    """
+
+    def __init__(self, job_id: str, redis_client=None, workers: int = 8):
+        self.job_id = job_id
+        self.redis_client = redis_client
+        self.max_workers = workers
+        self.engine = database.create_job_engine(workers)
+
+    def load_checkpoints(self):
+        """{range_start: (range_end, last_key, completed)} for this job"""
+        conn = self.engine.raw_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT range_start, range_end, last_key, completed "
+                "FROM bulk_import_checkpoints WHERE job_id = %s",
+                (self.job_id,)
+            )
+            return {start: (end, last_key, completed)
+                    for start, end, last_key, completed in cursor.fetchall()}
+        finally:
+            conn.close()
+
+    def register_units(self, units):
+        """Save the job's ranges, so a re-run resumes over the same ones"""
+        conn = self.engine.raw_connection()
+        try:
+            execute_values(
+                conn.cursor(),
+                "INSERT INTO bulk_import_checkpoints "
+                "(job_id, range_start, range_end, rows_imported, completed, updated_at) "
+                "VALUES %s ON CONFLICT (job_id, range_start) DO NOTHING",
+                [(self.job_id, start, end) for start, end in units],
+                template="(%s, %s, %s, 0, false, now())"
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def connect(self):
+        conn = self.engine.raw_connection()
+        cursor = conn.cursor()
+        cursor.execute(
+            "CREATE TEMP TABLE IF NOT EXISTS bulk_import_staging ("
+            " filename text, s3_key text, s3_bucket text, file_size bigint,"
+            " content_type text, project_id text, upload_timestamp timestamp"
+            ") ON COMMIT DELETE ROWS"
+        )
+        conn.commit()
+        return conn
+
+    def write_batch(self, conn, range_start: str, rows, last_key: str,
+                    completed: bool = False) -> int:
+        """COPY rows in and advance the checkpoint in one transaction.
+
+        Returns:
+            Number of new file_metadata rows
+        """
+        inserted, max_id = 0, None
+        cursor = conn.cursor()
+        try:
+            if rows:
+                buf = io.StringIO()
+                csv.writer(buf).writerows(rows)
+                buf.seek(0)
+                cursor.copy_expert(
+                    f"COPY bulk_import_staging ({', '.join(STAGING_COLUMNS)}) "
+                    "FROM STDIN WITH (FORMAT csv)",
+                    buf
+                )
+                cursor.execute(
+                    f"WITH new AS (INSERT INTO file_metadata ({', '.join(STAGING_COLUMNS)}) "
+                    f"SELECT {', '.join(STAGING_COLUMNS)} FROM bulk_import_staging "
+                    "ON CONFLICT (s3_key) DO NOTHING RETURNING id) "
+                    "SELECT count(*), max(id) FROM new"
+                )
+                inserted, max_id = cursor.fetchone()
+            cursor.execute(
+                "UPDATE bulk_import_checkpoints SET"
+                " last_key = COALESCE(%s, last_key),"
+                " rows_imported = rows_imported + %s,"
+                " completed = %s,"
+                " updated_at = now() "
+                "WHERE job_id = %s AND range_start = %s",
+                (last_key, inserted, completed, self.job_id, range_start)
+            )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            cursor.close()
+        if self.redis_client is not None:
+            api_cache.publish_file_ids(max_id, client=self.redis_client)
+        return inserted
+
+    def finalize(self):
+        """Refresh planner statistics once after the whole load"""
+        conn = self.engine.raw_connection()
+        try:
+            conn.cursor().execute("ANALYZE file_metadata")
+            conn.commit()
+        finally:
+            conn.close()
+
+
+def import_unit(s3, sink, bucket: str, prefix: str, unit, project_id: str,
+                batch_size: int, start_after: str = None) -> int:
+    """Import one (start, end) range, committing every batch_size objects"""
+    start, end = unit
+    conn = sink.connect()
+    total = 0
+    try:
+        rows, last_key = [], start_after
+        for page in scan_unit(s3, bucket, prefix, start, end, start_after):
+            for obj in page:
+                row = object_row(obj, bucket, project_id)
+                if row:
+                    rows.append(row)
+            last_key = page[-1]["Key"]
+            if len(rows) >= batch_size:
+                total += sink.write_batch(conn, start, rows, last_key)
+                rows = []
+        total += sink.write_batch(conn, start, rows, last_key, completed=True)
+    finally:
+        conn.close()
+    return total
+
+
+def invalidate_api_caches(client):
+    """Drop data-api's cached listings, stats and 404s after a bulk load"""
+    for pattern in ("cache:list_files:*", "cache:get_project_stats:*", "notfound:*"):
+        keys = list(client.scan_iter(match=pattern, count=1000))
+        for i in range(0, len(keys), 1000):
+            client.unlink(*keys[i:i + 1000])
+
+
+def run_import(s3, sink, bucket: str, prefix: str, project_id: str = None,
+               workers: int = 8, batch_size: int = 50000) -> int:
+    """Import every object under prefix, resuming from saved checkpoints.
+
+    Returns:
+        Number of new file_metadata rows
+    """
+    if workers > sink.max_workers:
+        logger.warning(
+            f"Limiting bulk import to {sink.max_workers} workers (sink connections)",
+            extra={"workers": workers}
+        )
+        workers = sink.max_workers
+
+    checkpoints = sink.load_checkpoints()
+    if checkpoints:
+        # Resume over exactly the ranges the job started with
+        all_units = sorted((start, end) for start, (end, _, _) in checkpoints.items())
+    else:
+        all_units = list_units(
+            s3, bucket, prefix, workers * RANGES_PER_WORKER, workers
+        )
+        sink.register_units(all_units)
+    units = [
+        unit for unit in all_units
+        if not checkpoints.get(unit[0], (None, None, False))[2]
+    ]
+    logger.info(
+        "Bulk import started",
+        extra={"bucket": bucket, "prefix": prefix, "units": len(units)}
+    )
+
+    total = 0
+    lock = threading.Lock()
+    started = time.monotonic()
+
+    def _work(unit):
+        nonlocal total
+        start_after = checkpoints.get(unit[0], (None, None, False))[1]
+        imported = import_unit(
+            s3, sink, bucket, prefix, unit, project_id, batch_size, start_after
+        )
+        with lock:
+            total += imported
+        logger.info(
+            "Bulk import unit done",
+            extra={"unit_start": unit[0], "unit_end": unit[1], "rows": imported}
+        )
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        # list() re-raises the first worker failure
+        list(pool.map(_work, units))
+
+    sink.finalize()
+    elapsed = time.monotonic() - started
+    logger.info(
+        "Bulk import complete",
+        extra={"rows": total, "seconds": round(elapsed, 1)}
+    )
+    return total
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk-register existing S3 objects")
+    parser.add_argument("--bucket", default=settings.S3_BUCKET_NAME)
+    parser.add_argument("--prefix", default="")
+    parser.add_argument("--project-id")
+    parser.add_argument("--job-id", help="checkpoint name; defaults to bucket/prefix")
+    parser.add_argument(
+        "--workers", type=int, default=8,
+        help="parallel listings; each holds one Postgres connection"
+    )
+    parser.add_argument("--batch-size", type=int, default=50000)
+    parser.add_argument(
+        "--redis-url", default=settings.REDIS_URL,
+        help="data-api Redis; new ids are published as they commit and "
+             "cached listings invalidated after the import"
+    )
+    args = parser.parse_args(argv)
+
+    from app.main import get_s3_client
+
+    redis_client = None
+    if args.redis_url:
+        import redis  # only needed when a Redis URL is given
+
+        redis_client = redis.from_url(args.redis_url)
+
+    sink = PostgresSink(
+        args.job_id or f"{args.bucket}/{args.prefix}", redis_client, workers=args.workers
+    )
+    run_import(
+        get_s3_client(), sink, args.bucket, args.prefix,
+        project_id=args.project_id, workers=args.workers, batch_size=args.batch_size
+    )
+    if redis_client is not None:
+        invalidate_api_caches(redis_client)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
@@ -27,10 +27,34 @@ class Settings(BaseSettings):
     AWS_REGION: str = os.getenv("AWS_REGION", "us-west-2")
     S3_BUCKET_NAME: str = os.getenv("S3_BUCKET_NAME", "aec-data-local")
     
+    # data-api's Redis; new file ids are published there (app.api_cache).
+    # Empty disables publishing.
+    REDIS_URL: str = os.getenv("REDIS_URL", "")
+    REDIS_SOCKET_TIMEOUT: float = 0.25
+    
     # File Upload
     MAX_UPLOAD_SIZE: int = 100 * 1024 * 1024  # 100MB
     ALLOWED_EXTENSIONS: list = ['.dwg', '.rvt', '.ifc', '.nwd', '.pdf', '.txt']
     
+    # Resumable (chunked) uploads; each chunk is one S3 multipart part, so
+    # chunks must be at least 5MB (except the last) and at most 10,000 parts.
+    # A part is buffered in memory while it is sent to S3 (briefly twice),
+    # so part uploads use at most about
+    # 2 x UPLOAD_CHUNK_SIZE x UPLOAD_MAX_CONCURRENT_PARTS = 256MB per pod.
+    UPLOAD_CHUNK_SIZE: int = 16 * 1024 * 1024  # 16MB
+    UPLOAD_MAX_CONCURRENT_PARTS: int = 8
+    RESUMABLE_MAX_UPLOAD_SIZE: int = 50 * 1024 * 1024 * 1024  # 50GB
+    # Pending uploads older than this are aborted by app.upload_reaper
+    UPLOAD_SESSION_TTL_HOURS: int = 72
+    
+    # Storage lifecycle (hot uploads/ -> cold archive prefix)
+    LIFECYCLE_COLD_AFTER_DAYS: int = 90
+    LIFECYCLE_ARCHIVE_PREFIX: str = "archive/"
+    LIFECYCLE_STORAGE_CLASS: str = "STANDARD_IA"
+    LIFECYCLE_BATCH_SIZE: int = 500
+    # Wait before deleting moved originals; must exceed data-api's CACHE_TTL
+    LIFECYCLE_DELETE_DELAY_SECONDS: int = 360
+    
     class Config:
         env_file = ".env"
         case_sensitive = True
@@ -7,23 +7,47 @@ from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.config import settings
 
-# Create database engine
-# - In prod, we expect a real DB (Postgres) with pooling.
-# - In tests/dev, sqlite is useful; sqlite does not support the same pooling args.
-engine_kwargs = {
-    "pool_pre_ping": True,  # Enable connection health checks
-}
-if settings.DATABASE_URL.startswith("sqlite"):
-    # Safe defaults for sqlite (especially in unit tests).
-    engine_kwargs["connect_args"] = {"check_same_thread": False}
-else:
-    engine_kwargs["pool_size"] = 10
-    engine_kwargs["max_overflow"] = 20
-
-engine = create_engine(settings.DATABASE_URL, **engine_kwargs)
-
-# Create session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+def _engine_kwargs():
+    # - In prod, we expect a real DB (Postgres) with pooling.
+    # - In tests/dev, sqlite is useful; sqlite does not support the same pooling args.
+    engine_kwargs = {
+        "pool_pre_ping": True,  # Enable connection health checks
+    }
+    if settings.DATABASE_URL.startswith("sqlite"):
+        # Safe defaults for sqlite (especially in unit tests).
+        engine_kwargs["connect_args"] = {"check_same_thread": False}
+    else:
+        engine_kwargs["pool_size"] = 10
+        engine_kwargs["max_overflow"] = 20
+    return engine_kwargs
+
+
+# The engine is created on first use rather than at import time so that
+# importing the app (and therefore pod start-up) does not pay for the DB
+# driver import and pool construction.
+engine = None
+
+# Session factory; bound to the engine by get_engine()
+SessionLocal = sessionmaker(autocommit=False, autoflush=False)
 
 # Base class for models
 Base = declarative_base()
+
+
+def get_engine():
+    """Return the shared engine, creating it on first call"""
+    global engine
+    if engine is None:
+        engine = create_engine(settings.DATABASE_URL, **_engine_kwargs())
+        SessionLocal.configure(bind=engine)
+    return engine
+
+
+def create_job_engine(connections: int):
+    """A separate engine for a batch job holding up to `connections` at once"""
+    engine_kwargs = _engine_kwargs()
+    if "pool_size" in engine_kwargs:
+        engine_kwargs["pool_size"] = connections
+        engine_kwargs["max_overflow"] = 0
+    return create_engine(settings.DATABASE_URL, **engine_kwargs)
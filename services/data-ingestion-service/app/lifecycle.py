@@ -0,0 +1,170 @@
+"""
+Storage lifecycle job
+Moves files that have not been read recently from the hot uploads/ prefix to
+the archive prefix under a cheaper S3 storage class, and updates s3_key.
+
+Only objects this service owns are moved: keys under uploads/ in
+settings.S3_BUCKET_NAME. Objects registered by app.bulk_import live in
+customer buckets and are left alone.
+
+Access stats (access_count / last_accessed_at) are recorded by data-api.
+Run periodically, e.g. from a Kubernetes CronJob:
+
+    python -m app.lifecycle
+"""
+
+import logging
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app import database, models
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+HOT_PREFIX = "uploads/"
+
+# S3 DeleteObjects accepts at most this many keys per call
+DELETE_BATCH_SIZE = 1000
+
+
+def archive_key(s3_key: str, archive_prefix: str) -> str:
+    """Key an object is moved to when it goes cold"""
+    return f"{archive_prefix}{s3_key}"
+
+
+def find_cold_files(db: Session, bucket: str, cutoff: datetime, after_id: int, limit: int):
+    """Hot uploads in bucket not read (or, if never read, not uploaded) since cutoff"""
+    last_seen = func.coalesce(
+        models.FileMetadata.last_accessed_at,
+        models.FileMetadata.upload_timestamp
+    )
+    return (
+        db.query(models.FileMetadata)
+        .filter(
+            models.FileMetadata.storage_tier == "hot",
+            models.FileMetadata.s3_bucket == bucket,
+            models.FileMetadata.s3_key.startswith(HOT_PREFIX, autoescape=True),
+            models.FileMetadata.id > after_id,
+            last_seen < cutoff
+        )
+        .order_by(models.FileMetadata.id)
+        .limit(limit)
+        .all()
+    )
+
+
+def move_to_cold(db: Session, s3, db_file: models.FileMetadata,
+                 archive_prefix: str, storage_class: str) -> str:
+    """Copy one object to the archive prefix and repoint its metadata.
+
+    The source object is not deleted here: data-api may still serve the
+    old s3_key from its cache, so run_lifecycle deletes sources only after
+    the cache TTL has passed.
+
+    Returns:
+        The old (now unreferenced) key
+    """
+    old_key = db_file.s3_key
+    new_key = archive_key(old_key, archive_prefix)
+
+    # Managed copy: falls back to multipart copy for objects over 5 GB.
+    s3.copy(
+        {"Bucket": db_file.s3_bucket, "Key": old_key},
+        db_file.s3_bucket,
+        new_key,
+        ExtraArgs={"StorageClass": storage_class}
+    )
+
+    db_file.s3_key = new_key
+    db_file.storage_tier = "cold"
+    db.commit()
+    return old_key
+
+
+def delete_sources(s3, bucket: str, keys) -> int:
+    """Delete moved source objects in batches; returns how many were deleted"""
+    deleted = 0
+    for i in range(0, len(keys), DELETE_BATCH_SIZE):
+        batch = keys[i:i + DELETE_BATCH_SIZE]
+        resp = s3.delete_objects(
+            Bucket=bucket,
+            Delete={"Objects": [{"Key": key} for key in batch], "Quiet": True}
+        )
+        for error in resp.get("Errors", []):
+            logger.error(
+                f"Failed to delete {error['Key']}: {error.get('Message')}",
+                extra={"s3_key": error["Key"]}
+            )
+        deleted += len(batch) - len(resp.get("Errors", []))
+    return deleted
+
+
+def run_lifecycle(db: Session, s3, bucket: str = None, cold_after_days: int = None,
+                  archive_prefix: str = None, storage_class: str = None,
+                  batch_size: int = None, delete_delay: float = None,
+                  now: datetime = None, sleep=time.sleep) -> int:
+    """Move every cold file to the archive tier.
+
+    Sources are deleted `delete_delay` seconds after the last move, once
+    data-api's cached metadata for them has expired. If the job is killed
+    during that wait the originals are left behind (the archive copy and
+    metadata are already consistent).
+
+    Returns:
+        Number of files moved
+    """
+    bucket = bucket or settings.S3_BUCKET_NAME
+    cold_after_days = cold_after_days if cold_after_days is not None \
+        else settings.LIFECYCLE_COLD_AFTER_DAYS
+    archive_prefix = archive_prefix or settings.LIFECYCLE_ARCHIVE_PREFIX
+    storage_class = storage_class or settings.LIFECYCLE_STORAGE_CLASS
+    batch_size = batch_size or settings.LIFECYCLE_BATCH_SIZE
+    delete_delay = delete_delay if delete_delay is not None \
+        else settings.LIFECYCLE_DELETE_DELAY_SECONDS
+    cutoff = (now or datetime.utcnow()) - timedelta(days=cold_after_days)
+
+    moved_keys = []
+    after_id = 0
+    while True:
+        batch = find_cold_files(db, bucket, cutoff, after_id, batch_size)
+        if not batch:
+            break
+        for db_file in batch:
+            file_id = after_id = db_file.id
+            try:
+                moved_keys.append(
+                    move_to_cold(db, s3, db_file, archive_prefix, storage_class)
+                )
+            except Exception as e:
+                db.rollback()
+                logger.error(
+                    f"Failed to archive file {file_id}: {e}",
+                    extra={"file_id": file_id}
+                )
+
+    if moved_keys:
+        sleep(delete_delay)
+        delete_sources(s3, bucket, moved_keys)
+
+    logger.info("Storage lifecycle run complete", extra={"moved": len(moved_keys)})
+    return len(moved_keys)
+
+
+def main():
+    from app.main import get_s3_client
+
+    database.get_engine()
+    db = database.SessionLocal()
+    try:
+        run_lifecycle(db, get_s3_client())
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
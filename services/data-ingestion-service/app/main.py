@@ -3,18 +3,22 @@ AEC Data Ingestion Service
 FastAPI-based microservice for handling file uploads and data ingestion
 """
 
+import asyncio
 import os
 import logging
+import uuid
+from contextlib import asynccontextmanager
 from datetime import datetime
 from typing import Optional
-import boto3
-from fastapi import FastAPI, File, UploadFile, Depends, HTTPException, status
+from fastapi import FastAPI, File, UploadFile, Depends, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import JSONResponse
+from sqlalchemy import text
 from sqlalchemy.orm import Session
 from prometheus_client import Counter, Histogram, generate_latest
 from pythonjsonlogger import jsonlogger
 
-from app import models, schemas, database
+from app import api_cache, models, schemas, database
 from app.config import settings
 
 # Configure structured logging
@@ -25,11 +29,28 @@ logger = logging.getLogger(__name__)
 logger.addHandler(logHandler)
 logger.setLevel(logging.INFO)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Startup/shutdown hooks.
+
+    Schema changes are applied by Alembic migrations (``alembic upgrade head``),
+    not here. The DB engine and S3 client are built before the first request,
+    in a worker thread so the boto3 import does not block the event loop.
+    """
+    logger.info("Starting Data Ingestion Service", extra={"event": "startup"})
+    await run_in_threadpool(database.get_engine)
+    await run_in_threadpool(get_s3_client)
+    yield
+    logger.info("Stopping Data Ingestion Service", extra={"event": "shutdown"})
+
+
 # Create FastAPI app
 app = FastAPI(
     title="AEC Data Ingestion Service",
     description="Handles file uploads for AEC data infrastructure",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Prometheus metrics
@@ -43,16 +64,28 @@ upload_duration = Histogram(
     'Time spent uploading files'
 )
 
-# Initialize S3 client
-s3_client = boto3.client(
-    's3',
-    aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-    aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-    region_name=settings.AWS_REGION
-)
+# S3 client, created at start-up (or first use) by get_s3_client()
+s3_client = None
+
+
+def get_s3_client():
+    """Return the shared S3 client, creating it on first use"""
+    global s3_client
+    if s3_client is None:
+        import boto3  # deferred: keeps the boto3 import out of module import
+
+        s3_client = boto3.client(
+            's3',
+            aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+            aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+            region_name=settings.AWS_REGION
+        )
+    return s3_client
+
 
 # Dependency to get database session
 def get_db():
+    database.get_engine()
     db = database.SessionLocal()
     try:
         yield db
@@ -60,13 +93,6 @@ def get_db():
         db.close()
 
 
-@app.on_event("startup")
-async def startup_event():
-    """Initialize database on startup"""
-    logger.info("Starting Data Ingestion Service", extra={"event": "startup"})
-    database.Base.metadata.create_all(bind=database.engine)
-
-
 @app.get("/health")
 async def health_check():
     """Health check endpoint for Kubernetes probes"""
@@ -82,10 +108,12 @@ async def readiness_check(db: Session = Depends(get_db)):
     """Readiness check - verifies database and S3 connectivity"""
     try:
         # Check database
-        db.execute("SELECT 1")
+        await run_in_threadpool(db.execute, text("SELECT 1"))
         
         # Check S3
-        s3_client.head_bucket(Bucket=settings.S3_BUCKET_NAME)
+        await run_in_threadpool(
+            get_s3_client().head_bucket, Bucket=settings.S3_BUCKET_NAME
+        )
         
         return {
             "status": "ready",
@@ -124,7 +152,7 @@ async def upload_file(
         logger.info(
             "File upload initiated",
             extra={
-                "filename": file.filename,
+                "original_filename": file.filename,
                 "content_type": file.content_type,
                 "project_id": project_id
             }
@@ -155,7 +183,7 @@ async def upload_file(
         
         # Upload to S3
         file_content = await file.read()
-        s3_client.put_object(
+        get_s3_client().put_object(
             Bucket=settings.S3_BUCKET_NAME,
             Key=s3_key,
             Body=file_content,
@@ -176,6 +204,7 @@ async def upload_file(
         db.add(db_file)
         db.commit()
         db.refresh(db_file)
+        await run_in_threadpool(api_cache.publish_file_ids, db_file.id, [db_file.id])
         
         logger.info(
             "File uploaded successfully",
@@ -209,6 +238,351 @@ async def upload_file(
         )
 
 
+# S3 allows at most this many parts in one multipart upload
+MULTIPART_MAX_PARTS = 10000
+
+# Bounds how many parts are buffered in memory at once (see config)
+part_upload_slots = asyncio.Semaphore(settings.UPLOAD_MAX_CONCURRENT_PARTS)
+
+
+def get_upload_session(db: Session, upload_id: str,
+                       for_update: bool = False) -> models.UploadSession:
+    """Load a resumable upload session or raise 404"""
+    upload = db.get(models.UploadSession, upload_id, with_for_update=for_update)
+    if not upload:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Upload not found"
+        )
+    return upload
+
+
+def upload_session_response(db: Session, upload: models.UploadSession):
+    """Build the client-facing state of an upload, including missing parts"""
+    received = [
+        part_number for (part_number,) in db.query(models.UploadPart.part_number)
+        .filter(models.UploadPart.session_id == upload.id)
+        .order_by(models.UploadPart.part_number)
+    ]
+    received_set = set(received)
+    return schemas.UploadSessionResponse(
+        upload_id=upload.id,
+        filename=upload.filename,
+        status=upload.status,
+        file_size=upload.file_size,
+        chunk_size=upload.chunk_size,
+        total_parts=upload.total_parts,
+        received_parts=received,
+        missing_parts=[
+            n for n in range(1, upload.total_parts + 1) if n not in received_set
+        ],
+        file_id=upload.file_id
+    )
+
+
+@app.post(
+    "/api/v1/uploads",
+    response_model=schemas.UploadSessionResponse,
+    status_code=status.HTTP_201_CREATED
+)
+async def create_upload(
+    upload: schemas.UploadCreateRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    Start a resumable upload for a large file
+    
+    The client then PUTs each chunk to /api/v1/uploads/{upload_id}/parts/{n}
+    (any order, retrying only parts listed in missing_parts) and finally
+    POSTs /api/v1/uploads/{upload_id}/complete. Each chunk is stored
+    directly as an S3 multipart part.
+    """
+    file_ext = os.path.splitext(upload.filename)[1].lower()
+    if file_ext not in settings.ALLOWED_EXTENSIONS:
+        file_uploads_counter.labels(status='rejected').inc()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"File type {file_ext} not supported"
+        )
+    if upload.file_size <= 0 or upload.file_size > settings.RESUMABLE_MAX_UPLOAD_SIZE:
+        file_uploads_counter.labels(status='rejected').inc()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"File size must be between 1 and {settings.RESUMABLE_MAX_UPLOAD_SIZE} bytes"
+        )
+    
+    # Grow the chunk size if needed to stay within S3's part limit
+    chunk_size = max(
+        settings.UPLOAD_CHUNK_SIZE,
+        -(-upload.file_size // MULTIPART_MAX_PARTS)
+    )
+    total_parts = -(-upload.file_size // chunk_size)
+    
+    timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+    s3_key = f"uploads/{upload.project_id or 'general'}/{timestamp}_{upload.filename}"
+    content_type = upload.content_type or 'application/octet-stream'
+    
+    s3 = get_s3_client()
+    multipart = await run_in_threadpool(
+        s3.create_multipart_upload,
+        Bucket=settings.S3_BUCKET_NAME,
+        Key=s3_key,
+        ContentType=content_type
+    )
+    
+    db_upload = models.UploadSession(
+        id=uuid.uuid4().hex,
+        filename=upload.filename,
+        s3_key=s3_key,
+        s3_bucket=settings.S3_BUCKET_NAME,
+        s3_upload_id=multipart["UploadId"],
+        file_size=upload.file_size,
+        chunk_size=chunk_size,
+        total_parts=total_parts,
+        content_type=content_type,
+        project_id=upload.project_id,
+        description=upload.description,
+        status="pending"
+    )
+    try:
+        db.add(db_upload)
+        db.commit()
+    except Exception as e:
+        # Don't leave a billed multipart upload that nothing refers to
+        db.rollback()
+        await run_in_threadpool(
+            s3.abort_multipart_upload,
+            Bucket=settings.S3_BUCKET_NAME,
+            Key=s3_key,
+            UploadId=multipart["UploadId"]
+        )
+        logger.error(f"Creating upload failed: {str(e)}", exc_info=True)
+        file_uploads_counter.labels(status='error').inc()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"File upload failed: {str(e)}"
+        )
+    
+    logger.info(
+        "Resumable upload created",
+        extra={
+            "upload_id": db_upload.id,
+            "original_filename": upload.filename,
+            "size": upload.file_size,
+            "parts": total_parts
+        }
+    )
+    
+    return upload_session_response(db, db_upload)
+
+
+@app.get("/api/v1/uploads/{upload_id}", response_model=schemas.UploadSessionResponse)
+async def get_upload(upload_id: str, db: Session = Depends(get_db)):
+    """Resumable upload state; clients resume by sending missing_parts"""
+    return upload_session_response(db, get_upload_session(db, upload_id))
+
+
+@app.put("/api/v1/uploads/{upload_id}/parts/{part_number}")
+async def upload_part(
+    upload_id: str,
+    part_number: int,
+    request: Request,
+    db: Session = Depends(get_db)
+):
+    """
+    Store one chunk of a resumable upload (raw request body)
+    
+    Part n covers bytes [(n - 1) * chunk_size, n * chunk_size) of the file.
+    Re-sending a part replaces it, so retries are safe.
+    """
+    db_upload = get_upload_session(db, upload_id)
+    if db_upload.status != "pending":
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Upload is {db_upload.status}"
+        )
+    if not 1 <= part_number <= db_upload.total_parts:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Part number must be between 1 and {db_upload.total_parts}"
+        )
+    
+    if part_number < db_upload.total_parts:
+        expected_size = db_upload.chunk_size
+    else:
+        expected_size = db_upload.file_size - db_upload.chunk_size * (db_upload.total_parts - 1)
+    
+    declared_size = request.headers.get("content-length")
+    if declared_size is not None and declared_size != str(expected_size):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Part {part_number} must be {expected_size} bytes, got {declared_size}"
+        )
+    
+    async with part_upload_slots:
+        # Read at most one byte more than expected, whatever the client sends
+        chunks, received = [], 0
+        async for chunk in request.stream():
+            chunks.append(chunk)
+            received += len(chunk)
+            if received > expected_size:
+                break
+        if received != expected_size:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Part {part_number} must be {expected_size} bytes, got {received}"
+            )
+        body = b"".join(chunks)
+        del chunks  # only the joined copy stays in memory
+        
+        s3 = get_s3_client()
+        try:
+            part = await run_in_threadpool(
+                s3.upload_part,
+                Bucket=db_upload.s3_bucket,
+                Key=db_upload.s3_key,
+                UploadId=db_upload.s3_upload_id,
+                PartNumber=part_number,
+                Body=body
+            )
+        except s3.exceptions.NoSuchUpload:
+            # Aborted or expired after the status check above
+            file_uploads_counter.labels(status='rejected').inc()
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Upload is no longer pending"
+            )
+        except Exception as e:
+            logger.error(f"Uploading part failed: {str(e)}", exc_info=True)
+            file_uploads_counter.labels(status='error').inc()
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"File upload failed: {str(e)}"
+            )
+    
+    db.merge(models.UploadPart(
+        session_id=db_upload.id,
+        part_number=part_number,
+        etag=part["ETag"],
+        size=len(body)
+    ))
+    db.commit()
+    
+    return {"upload_id": upload_id, "part_number": part_number, "size": len(body)}
+
+
+@app.post(
+    "/api/v1/uploads/{upload_id}/complete",
+    response_model=schemas.FileUploadResponse
+)
+async def complete_upload(upload_id: str, db: Session = Depends(get_db)):
+    """Assemble the uploaded parts in S3 and store the file metadata"""
+    # Row lock: concurrent completes for the same upload run one at a time,
+    # and the second sees status "completed".
+    db_upload = get_upload_session(db, upload_id, for_update=True)
+    
+    if db_upload.status == "completed":
+        db_file = db.get(models.FileMetadata, db_upload.file_id)
+    else:
+        if db_upload.status != "pending":
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Upload is {db_upload.status}"
+            )
+        
+        parts = db.query(models.UploadPart).filter(
+            models.UploadPart.session_id == db_upload.id
+        ).order_by(models.UploadPart.part_number).all()
+        missing = db_upload.total_parts - len(parts)
+        if missing:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Upload incomplete: {missing} parts missing"
+            )
+        
+        try:
+            await run_in_threadpool(
+                get_s3_client().complete_multipart_upload,
+                Bucket=db_upload.s3_bucket,
+                Key=db_upload.s3_key,
+                UploadId=db_upload.s3_upload_id,
+                MultipartUpload={
+                    "Parts": [
+                        {"PartNumber": p.part_number, "ETag": p.etag} for p in parts
+                    ]
+                }
+            )
+            
+            db_file = models.FileMetadata(
+                filename=db_upload.filename,
+                s3_key=db_upload.s3_key,
+                s3_bucket=db_upload.s3_bucket,
+                file_size=db_upload.file_size,
+                content_type=db_upload.content_type,
+                project_id=db_upload.project_id,
+                description=db_upload.description,
+                upload_timestamp=datetime.utcnow()
+            )
+            db.add(db_file)
+            db.flush()
+            db_upload.file_id = db_file.id
+            db_upload.status = "completed"
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Completing upload failed: {str(e)}", exc_info=True)
+            file_uploads_counter.labels(status='error').inc()
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"File upload failed: {str(e)}"
+            )
+        await run_in_threadpool(api_cache.publish_file_ids, db_file.id, [db_file.id])
+        
+        logger.info(
+            "Resumable upload completed",
+            extra={
+                "upload_id": db_upload.id,
+                "file_id": db_file.id,
+                "s3_key": db_file.s3_key,
+                "size": db_file.file_size
+            }
+        )
+        file_uploads_counter.labels(status='success').inc()
+    
+    return schemas.FileUploadResponse(
+        id=db_file.id,
+        filename=db_file.filename,
+        s3_key=db_file.s3_key,
+        s3_bucket=db_file.s3_bucket,
+        file_size=db_file.file_size,
+        upload_timestamp=db_file.upload_timestamp,
+        message="File uploaded successfully"
+    )
+
+
+@app.delete("/api/v1/uploads/{upload_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def abort_upload(upload_id: str, db: Session = Depends(get_db)):
+    """Abandon a resumable upload and release its S3 parts"""
+    db_upload = get_upload_session(db, upload_id, for_update=True)
+    if db_upload.status != "pending":
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Upload is {db_upload.status}"
+        )
+    
+    await run_in_threadpool(
+        get_s3_client().abort_multipart_upload,
+        Bucket=db_upload.s3_bucket,
+        Key=db_upload.s3_key,
+        UploadId=db_upload.s3_upload_id
+    )
+    db.query(models.UploadPart).filter(
+        models.UploadPart.session_id == db_upload.id
+    ).delete()
+    db_upload.status = "aborted"
+    db.commit()
+
+
 @app.get("/api/v1/files/{file_id}", response_model=schemas.FileMetadataResponse)
 async def get_file_metadata(file_id: int, db: Session = Depends(get_db)):
     """Retrieve file metadata by ID"""
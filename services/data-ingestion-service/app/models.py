@@ -3,7 +3,7 @@ Database models for Data Ingestion Service
 """
 
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, BigInteger
+from sqlalchemy import Column, Integer, String, DateTime, BigInteger, Boolean, ForeignKey
 from app.database import Base
 
 
@@ -20,6 +20,66 @@ class FileMetadata(Base):
     project_id = Column(String, index=True)
     description = Column(String)
     upload_timestamp = Column(DateTime, default=datetime.utcnow)
+    # Access stats, flushed in batches from Redis by data-api
+    access_count = Column(BigInteger, nullable=False, default=0, server_default="0")
+    last_accessed_at = Column(DateTime)
+    # "hot" (uploads/ prefix) or "cold" (archive prefix, cheaper storage class)
+    storage_tier = Column(String, nullable=False, default="hot", server_default="hot", index=True)
     
     def __repr__(self):
         return f"<FileMetadata(id={self.id}, filename={self.filename})>"
+
+
+class UploadSession(Base):
+    """Resumable upload in progress, backed by an S3 multipart upload.
+
+    Kept in the database so any replica can accept the next chunk.
+    """
+    __tablename__ = "upload_sessions"
+    
+    id = Column(String, primary_key=True)
+    filename = Column(String, nullable=False)
+    s3_key = Column(String, nullable=False, unique=True)
+    s3_bucket = Column(String, nullable=False)
+    s3_upload_id = Column(String, nullable=False)
+    file_size = Column(BigInteger, nullable=False)
+    chunk_size = Column(BigInteger, nullable=False)
+    total_parts = Column(Integer, nullable=False)
+    content_type = Column(String)
+    project_id = Column(String)
+    description = Column(String)
+    # "pending", "completed", "aborted" or "expired"
+    status = Column(String, nullable=False, default="pending")
+    file_id = Column(Integer, ForeignKey("file_metadata.id"))
+    created_at = Column(DateTime, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f"<UploadSession(id={self.id}, filename={self.filename})>"
+
+
+class UploadPart(Base):
+    """A chunk of an UploadSession that has been stored as an S3 part"""
+    __tablename__ = "upload_parts"
+    
+    session_id = Column(
+        String, ForeignKey("upload_sessions.id", ondelete="CASCADE"), primary_key=True
+    )
+    part_number = Column(Integer, primary_key=True)
+    etag = Column(String, nullable=False)
+    size = Column(BigInteger, nullable=False)
+
+
+class BulkImportCheckpoint(Base):
+    """Progress of one key range within a bulk import job (see app.bulk_import)"""
+    __tablename__ = "bulk_import_checkpoints"
+    
+    job_id = Column(String, primary_key=True)
+    # The range covers keys after range_start ("" = from the start of the
+    # job's prefix) up to and including range_end (NULL = to its end)
+    range_start = Column(String, primary_key=True)
+    range_end = Column(String)
+    # Last S3 key imported; listing resumes after it
+    last_key = Column(String)
+    rows_imported = Column(BigInteger, nullable=False, default=0)
+    completed = Column(Boolean, nullable=False, default=False)
+    updated_at = Column(DateTime, default=datetime.utcnow)
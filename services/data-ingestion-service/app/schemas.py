@@ -3,7 +3,7 @@ Pydantic schemas for request/response validation
 """
 
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from pydantic import BaseModel
 
 
@@ -32,6 +32,31 @@ class FileMetadataResponse(BaseModel):
     project_id: Optional[str]
     description: Optional[str]
     upload_timestamp: datetime
+    access_count: int = 0
+    last_accessed_at: Optional[datetime] = None
+    storage_tier: str = "hot"
     
     class Config:
         from_attributes = True
+
+
+class UploadCreateRequest(BaseModel):
+    """Request schema for starting a resumable upload"""
+    filename: str
+    file_size: int
+    content_type: Optional[str] = None
+    project_id: Optional[str] = None
+    description: Optional[str] = None
+
+
+class UploadSessionResponse(BaseModel):
+    """Response schema for resumable upload state"""
+    upload_id: str
+    filename: str
+    status: str
+    file_size: int
+    chunk_size: int
+    total_parts: int
+    received_parts: List[int]
+    missing_parts: List[int]
+    file_id: Optional[int] = None
@@ -0,0 +1,81 @@
+"""
+Stale upload reaper
+Aborts resumable uploads that have stayed pending longer than
+UPLOAD_SESSION_TTL_HOURS, so abandoned S3 multipart parts stop being billed.
+
+Run periodically, e.g. from a Kubernetes CronJob:
+
+    python -m app.upload_reaper
+"""
+
+import logging
+from datetime import datetime, timedelta
+
+from sqlalchemy.orm import Session
+
+from app import database, models
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def reap_stale_uploads(db: Session, s3, ttl_hours: int = None,
+                       batch_size: int = 100, now: datetime = None) -> int:
+    """Abort every pending upload created before the TTL cutoff.
+
+    Returns:
+        Number of uploads expired
+    """
+    ttl_hours = ttl_hours if ttl_hours is not None else settings.UPLOAD_SESSION_TTL_HOURS
+    cutoff = (now or datetime.utcnow()) - timedelta(hours=ttl_hours)
+
+    expired = 0
+    while True:
+        # skip_locked: leave sessions that a complete/abort request holds
+        batch = (
+            db.query(models.UploadSession)
+            .filter(
+                models.UploadSession.status == "pending",
+                models.UploadSession.created_at < cutoff
+            )
+            .order_by(models.UploadSession.created_at)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+        if not batch:
+            break
+        for db_upload in batch:
+            try:
+                s3.abort_multipart_upload(
+                    Bucket=db_upload.s3_bucket,
+                    Key=db_upload.s3_key,
+                    UploadId=db_upload.s3_upload_id
+                )
+            except s3.exceptions.NoSuchUpload:
+                pass  # already gone in S3; just close the session
+            db.query(models.UploadPart).filter(
+                models.UploadPart.session_id == db_upload.id
+            ).delete()
+            db_upload.status = "expired"
+            expired += 1
+        db.commit()
+
+    logger.info("Stale upload reap complete", extra={"expired": expired})
+    return expired
+
+
+def main():
+    from app.main import get_s3_client
+
+    database.get_engine()
+    db = database.SessionLocal()
+    try:
+        reap_stale_uploads(db, get_s3_client())
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
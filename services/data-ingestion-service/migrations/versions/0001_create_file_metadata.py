@@ -0,0 +1,44 @@
+"""create file_metadata
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Databases bootstrapped by infrastructure/docker-compose/init-db.sql (or
+    # by the old create_all() startup hook) already have the table; adopt it
+    # as the baseline instead of failing.
+    if sa.inspect(op.get_bind()).has_table("file_metadata"):
+        return
+
+    op.create_table(
+        "file_metadata",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("filename", sa.String(), nullable=False),
+        sa.Column("s3_key", sa.String(), nullable=False, unique=True),
+        sa.Column("s3_bucket", sa.String(), nullable=False),
+        sa.Column("file_size", sa.BigInteger(), nullable=False),
+        sa.Column("content_type", sa.String()),
+        sa.Column("project_id", sa.String()),
+        sa.Column("description", sa.String()),
+        sa.Column("upload_timestamp", sa.DateTime()),
+    )
+    op.create_index("ix_file_metadata_id", "file_metadata", ["id"])
+    op.create_index("ix_file_metadata_project_id", "file_metadata", ["project_id"])
+
+
+def downgrade():
+    op.drop_index("ix_file_metadata_project_id", table_name="file_metadata")
+    op.drop_index("ix_file_metadata_id", table_name="file_metadata")
+    op.drop_table("file_metadata")
@@ -0,0 +1,45 @@
+"""access stats and storage tier
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Skip anything already present, e.g. on databases bootstrapped from an
+    # init-db.sql that declared these columns.
+    inspector = sa.inspect(op.get_bind())
+    columns = {c["name"] for c in inspector.get_columns("file_metadata")}
+    indexes = {i["name"] for i in inspector.get_indexes("file_metadata")}
+
+    if "access_count" not in columns:
+        op.add_column(
+            "file_metadata",
+            sa.Column("access_count", sa.BigInteger(), nullable=False, server_default="0"),
+        )
+    if "last_accessed_at" not in columns:
+        op.add_column("file_metadata", sa.Column("last_accessed_at", sa.DateTime()))
+    if "storage_tier" not in columns:
+        op.add_column(
+            "file_metadata",
+            sa.Column("storage_tier", sa.String(), nullable=False, server_default="hot"),
+        )
+    if "ix_file_metadata_storage_tier" not in indexes:
+        op.create_index("ix_file_metadata_storage_tier", "file_metadata", ["storage_tier"])
+
+
+def downgrade():
+    op.drop_index("ix_file_metadata_storage_tier", table_name="file_metadata")
+    op.drop_column("file_metadata", "storage_tier")
+    op.drop_column("file_metadata", "last_accessed_at")
+    op.drop_column("file_metadata", "access_count")
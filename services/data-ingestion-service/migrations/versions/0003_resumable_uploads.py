@@ -0,0 +1,51 @@
+"""resumable uploads
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "upload_sessions",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("filename", sa.String(), nullable=False),
+        sa.Column("s3_key", sa.String(), nullable=False, unique=True),
+        sa.Column("s3_bucket", sa.String(), nullable=False),
+        sa.Column("s3_upload_id", sa.String(), nullable=False),
+        sa.Column("file_size", sa.BigInteger(), nullable=False),
+        sa.Column("chunk_size", sa.BigInteger(), nullable=False),
+        sa.Column("total_parts", sa.Integer(), nullable=False),
+        sa.Column("content_type", sa.String()),
+        sa.Column("project_id", sa.String()),
+        sa.Column("description", sa.String()),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("file_id", sa.Integer(), sa.ForeignKey("file_metadata.id")),
+        sa.Column("created_at", sa.DateTime()),
+    )
+    op.create_table(
+        "upload_parts",
+        sa.Column(
+            "session_id", sa.String(),
+            sa.ForeignKey("upload_sessions.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("part_number", sa.Integer(), primary_key=True),
+        sa.Column("etag", sa.String(), nullable=False),
+        sa.Column("size", sa.BigInteger(), nullable=False),
+    )
+
+
+def downgrade():
+    op.drop_table("upload_parts")
+    op.drop_table("upload_sessions")
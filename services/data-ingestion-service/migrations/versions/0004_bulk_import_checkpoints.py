@@ -0,0 +1,31 @@
+"""bulk import checkpoints
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "bulk_import_checkpoints",
+        sa.Column("job_id", sa.String(), primary_key=True),
+        sa.Column("prefix", sa.String(), primary_key=True),
+        sa.Column("last_key", sa.String()),
+        sa.Column("rows_imported", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("completed", sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column("updated_at", sa.DateTime()),
+    )
+
+
+def downgrade():
+    op.drop_table("bulk_import_checkpoints")
@@ -0,0 +1,34 @@
+"""bulk import checkpoints per key range
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19
+
+Bulk import units are now key ranges rather than first-level prefixes.
+Checkpoints of the old layout cannot be mapped onto ranges, so they are
+dropped; re-running such a job re-lists it, and ON CONFLICT (s3_key)
+skips the rows it already imported.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("DELETE FROM bulk_import_checkpoints")
+    with op.batch_alter_table("bulk_import_checkpoints") as batch:
+        batch.alter_column("prefix", new_column_name="range_start")
+        batch.add_column(sa.Column("range_end", sa.String()))
+
+
+def downgrade():
+    op.execute("DELETE FROM bulk_import_checkpoints")
+    with op.batch_alter_table("bulk_import_checkpoints") as batch:
+        batch.drop_column("range_end")
+        batch.alter_column("range_start", new_column_name="prefix")
@@ -0,0 +1,45 @@
+import os
+
+import pytest
+
+# app.config reads the environment once at import, and some test modules
+# import app.* at collection time; point those imports at sqlite and
+# placeholder AWS settings before any of them run.
+os.environ.setdefault("DATABASE_URL", "sqlite+pysqlite:///:memory:")
+os.environ.setdefault("AWS_ACCESS_KEY_ID", "test")
+os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "test")
+os.environ.setdefault("AWS_REGION", "us-west-2")
+os.environ.setdefault("S3_BUCKET_NAME", "test-bucket")
+
+
+class _FakeRedis:
+    """Just enough of redis-py for app.api_cache"""
+
+    def __init__(self):
+        self.zsets = {}
+        self.deleted = []
+
+    def zadd(self, key, mapping, gt=False):
+        zset = self.zsets.setdefault(key, {})
+        for member, score in mapping.items():
+            if not gt or score > zset.get(member, float("-inf")):
+                zset[member] = score
+
+    def delete(self, *keys):
+        self.deleted.extend(keys)
+
+    def pipeline(self, transaction=True):
+        return self
+
+    def execute(self):
+        return []
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    """Install an in-memory client for data-api's Redis"""
+    from app import api_cache
+
+    fake = _FakeRedis()
+    monkeypatch.setattr(api_cache, "redis_client", fake)
+    return fake
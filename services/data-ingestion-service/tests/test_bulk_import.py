@@ -0,0 +1,280 @@
+import boto3
+import pytest
+from moto import mock_aws
+from sqlalchemy import text
+
+from app import api_cache, bulk_import, database
+from app.config import settings
+from app.database import Base
+
+BUCKET = "customer-bucket"
+KEYS = [
+    "cust/a.rvt",
+    "cust/p1/sub/y.ifc",
+    "cust/p1/x.dwg",
+    "cust/p2/",
+    "cust/p2/readme.exe",
+    "cust/p2/z.pdf",
+    "other/ignored.dwg",
+]
+
+
+class _FakeSink:
+    """In-memory stand-in for PostgresSink with the same conflict semantics"""
+
+    def __init__(self, checkpoints=None, fail_after=None, max_workers=8):
+        self.checkpoints = dict(checkpoints or {})
+        self.rows = {}
+        self.batches = 0
+        self.fail_after = fail_after
+        self.max_workers = max_workers
+        self.finalized = False
+
+    def load_checkpoints(self):
+        return dict(self.checkpoints)
+
+    def register_units(self, units):
+        for start, end in units:
+            self.checkpoints.setdefault(start, (end, None, False))
+
+    def connect(self):
+        return self
+
+    def close(self):
+        return None
+
+    def write_batch(self, conn, range_start, rows, last_key, completed=False):
+        if self.fail_after is not None and self.batches >= self.fail_after:
+            raise RuntimeError("connection lost")
+        self.batches += 1
+        inserted = 0
+        for row in rows:
+            if row[1] not in self.rows:
+                self.rows[row[1]] = row
+                inserted += 1
+        end, previous, _ = self.checkpoints[range_start]
+        self.checkpoints[range_start] = (end, last_key or previous, completed)
+        return inserted
+
+    def finalize(self):
+        self.finalized = True
+
+
+def _put(client, keys):
+    for key in keys:
+        client.put_object(Bucket=BUCKET, Key=key, Body=b"x" * 3)
+
+
+@pytest.fixture
+def s3():
+    with mock_aws():
+        client = boto3.client("s3", region_name="us-west-2")
+        client.create_bucket(
+            Bucket=BUCKET,
+            CreateBucketConfiguration={"LocationConstraint": "us-west-2"}
+        )
+        _put(client, KEYS)
+        yield client
+
+
+def test_imports_every_supported_object(s3):
+    sink = _FakeSink()
+    total = bulk_import.run_import(
+        s3, sink, BUCKET, "cust/", project_id="proj042", workers=4, batch_size=1
+    )
+
+    assert total == 4
+    assert sorted(sink.rows) == [
+        "cust/a.rvt", "cust/p1/sub/y.ifc", "cust/p1/x.dwg", "cust/p2/z.pdf"
+    ]
+    row = sink.rows["cust/p1/x.dwg"]
+    assert row[0] == "x.dwg"
+    assert row[2:4] == (BUCKET, 3)
+    assert row[5] == "proj042"
+    assert sink.finalized
+    assert len(sink.checkpoints) > 1
+    assert all(completed for _, _, completed in sink.checkpoints.values())
+
+
+def test_flat_prefix_is_split_into_ranges_covering_every_key(s3):
+    keys = [f"flat/{i * 7919 % 1000:03d}-{i}.dwg" for i in range(300)]
+    _put(s3, keys)
+
+    units = bulk_import.list_units(s3, BUCKET, "flat/", min_units=16)
+
+    assert len(units) >= 16
+    assert units[0][0] == "" and units[-1][1] is None
+    assert all(a[1] == b[0] for a, b in zip(units, units[1:]))
+    scanned = [
+        obj["Key"]
+        for start, end in units
+        for page in bulk_import.scan_unit(s3, BUCKET, "flat/", start, end, page_size=50)
+        for obj in page
+    ]
+    assert scanned == sorted(keys)
+    # Every range holds part of the listing
+    sizes = [
+        sum(len(page) for page in bulk_import.scan_unit(s3, BUCKET, "flat/", start, end))
+        for start, end in units
+    ]
+    assert all(sizes) and max(sizes) < len(keys) / 2
+
+
+def test_resumes_over_saved_ranges(s3, monkeypatch):
+    def _no_listing(*args, **kwargs):
+        raise AssertionError("a resumed job must reuse its saved ranges")
+
+    monkeypatch.setattr(bulk_import, "list_units", _no_listing)
+    sink = _FakeSink(checkpoints={
+        "": ("cust/p1/x.dwg", "cust/a.rvt", False),
+        "cust/p1/x.dwg": (None, "cust/p2/z.pdf", True),
+    })
+    total = bulk_import.run_import(s3, sink, BUCKET, "cust/", workers=16)
+
+    assert total == 2
+    assert sorted(sink.rows) == ["cust/p1/sub/y.ifc", "cust/p1/x.dwg"]
+
+
+def test_interrupted_import_completes_on_rerun(s3):
+    sink = _FakeSink(fail_after=2)
+    with pytest.raises(RuntimeError):
+        bulk_import.run_import(s3, sink, BUCKET, "cust/", workers=1, batch_size=1)
+    assert not sink.finalized
+
+    sink.fail_after = None
+    bulk_import.run_import(s3, sink, BUCKET, "cust/", workers=1, batch_size=1)
+
+    assert len(sink.rows) == 4
+    assert sink.finalized
+
+
+def test_workers_capped_at_sink_connections(s3, monkeypatch):
+    pools = []
+    real_pool = bulk_import.ThreadPoolExecutor
+
+    def _pool(max_workers):
+        pools.append(max_workers)
+        return real_pool(max_workers=max_workers)
+
+    monkeypatch.setattr(bulk_import, "ThreadPoolExecutor", _pool)
+    sink = _FakeSink(max_workers=3)
+    assert bulk_import.run_import(s3, sink, BUCKET, "cust/", workers=64) == 4
+    assert pools and set(pools) == {3}
+
+
+postgres_only = pytest.mark.skipif(
+    not settings.DATABASE_URL.startswith("postgresql"),
+    reason="needs DATABASE_URL pointing at Postgres (COPY / ON CONFLICT)"
+)
+
+JOB_ID = "test-bulk-import"
+
+
+@pytest.fixture
+def pg():
+    engine = database.get_engine()
+    Base.metadata.create_all(bind=engine)
+
+    def _cleanup():
+        with engine.begin() as conn:
+            conn.execute(
+                text("DELETE FROM file_metadata WHERE s3_bucket = :b"), {"b": BUCKET}
+            )
+            conn.execute(
+                text("DELETE FROM bulk_import_checkpoints WHERE job_id = :j"), {"j": JOB_ID}
+            )
+
+    _cleanup()
+    yield engine
+    _cleanup()
+
+
+def _imported(engine):
+    with engine.connect() as conn:
+        return {
+            row.s3_key: row for row in conn.execute(
+                text("SELECT * FROM file_metadata WHERE s3_bucket = :b"), {"b": BUCKET}
+            )
+        }
+
+
+def _checkpoints(engine):
+    with engine.connect() as conn:
+        return {
+            row.range_start: row for row in conn.execute(
+                text("SELECT * FROM bulk_import_checkpoints WHERE job_id = :j"),
+                {"j": JOB_ID}
+            )
+        }
+
+
+class _InterruptedSink(bulk_import.PostgresSink):
+    def __init__(self, job_id, fail_after):
+        super().__init__(job_id)
+        self.fail_after = fail_after
+        self.batches = 0
+
+    def write_batch(self, *args, **kwargs):
+        if self.batches >= self.fail_after:
+            raise RuntimeError("connection lost")
+        self.batches += 1
+        return super().write_batch(*args, **kwargs)
+
+
+@postgres_only
+def test_postgres_copy_skips_existing_keys(s3, pg, fake_redis):
+    with pg.begin() as conn:
+        conn.execute(text(
+            "INSERT INTO file_metadata (filename, s3_key, s3_bucket, file_size, project_id) "
+            "VALUES ('a.rvt', 'cust/a.rvt', :b, 99, 'existing')"
+        ), {"b": BUCKET})
+
+    sink = bulk_import.PostgresSink(JOB_ID, redis_client=fake_redis)
+    total = bulk_import.run_import(
+        s3, sink, BUCKET, "cust/", project_id="proj042", workers=3, batch_size=1
+    )
+
+    assert total == 3
+    rows = _imported(pg)
+    assert sorted(rows) == [
+        "cust/a.rvt", "cust/p1/sub/y.ifc", "cust/p1/x.dwg", "cust/p2/z.pdf"
+    ]
+    # Conflicting key left untouched
+    assert rows["cust/a.rvt"].file_size == 99
+    assert rows["cust/a.rvt"].project_id == "existing"
+    new = rows["cust/p1/x.dwg"]
+    assert (new.filename, new.file_size, new.project_id) == ("x.dwg", 3, "proj042")
+    assert new.storage_tier == "hot" and new.access_count == 0
+
+    checkpoints = _checkpoints(pg)
+    assert all(cp.completed for cp in checkpoints.values())
+    assert sum(cp.rows_imported for cp in checkpoints.values()) == 3
+    # Each batch publishes its largest new id to data-api
+    assert fake_redis.zsets[api_cache.FILE_ID_HIGH_WATER_KEY] == {
+        "max": max(row.id for row in rows.values())
+    }
+
+
+@postgres_only
+def test_postgres_import_resumes_from_checkpoint(s3, pg):
+    with pytest.raises(RuntimeError):
+        bulk_import.run_import(
+            s3, _InterruptedSink(JOB_ID, fail_after=2), BUCKET, "cust/",
+            workers=1, batch_size=1
+        )
+    imported = len(_imported(pg))
+    assert 0 < imported < 4
+    ranges = _checkpoints(pg)
+    assert not all(cp.completed for cp in ranges.values())
+
+    total = bulk_import.run_import(
+        s3, bulk_import.PostgresSink(JOB_ID), BUCKET, "cust/", workers=1, batch_size=1
+    )
+
+    assert total == 4 - imported
+    assert len(_imported(pg)) == 4
+    checkpoints = _checkpoints(pg)
+    # The rerun works through the ranges registered by the first run
+    assert sorted(checkpoints) == sorted(ranges)
+    assert all(cp.completed for cp in checkpoints.values())
+    assert sum(cp.rows_imported for cp in checkpoints.values()) == 4
@@ -0,0 +1,121 @@
+from datetime import datetime, timedelta
+
+import boto3
+import pytest
+from moto import mock_aws
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import lifecycle, models
+from app.database import Base
+
+BUCKET = "test-bucket"
+NOW = datetime(2026, 6, 1)
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite+pysqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def s3():
+    with mock_aws():
+        client = boto3.client("s3", region_name="us-west-2")
+        client.create_bucket(
+            Bucket=BUCKET,
+            CreateBucketConfiguration={"LocationConstraint": "us-west-2"}
+        )
+        yield client
+
+
+def _add_file(db, s3, key, uploaded, last_accessed=None, bucket=BUCKET):
+    s3.put_object(Bucket=bucket, Key=key, Body=b"model-bytes")
+    db_file = models.FileMetadata(
+        filename=key.rsplit("/", 1)[-1],
+        s3_key=key,
+        s3_bucket=bucket,
+        file_size=11,
+        upload_timestamp=uploaded,
+        last_accessed_at=last_accessed
+    )
+    db.add(db_file)
+    db.commit()
+    return db_file.id
+
+
+def test_cold_files_move_to_archive(db, s3):
+    old = NOW - timedelta(days=200)
+    never_read = _add_file(db, s3, "uploads/p1/never_read.rvt", old)
+    read_long_ago = _add_file(db, s3, "uploads/p1/stale.ifc", old, NOW - timedelta(days=120))
+    read_recently = _add_file(db, s3, "uploads/p1/hot.dwg", old, NOW - timedelta(days=2))
+    new_upload = _add_file(db, s3, "uploads/p2/new.pdf", NOW - timedelta(days=1))
+
+    waits = []
+
+    def _sleep(seconds):
+        # Originals must still exist while data-api may serve cached keys
+        waits.append(seconds)
+        s3.head_object(Bucket=BUCKET, Key="uploads/p1/never_read.rvt")
+
+    moved = lifecycle.run_lifecycle(
+        db, s3, bucket=BUCKET, cold_after_days=90, archive_prefix="archive/",
+        storage_class="STANDARD_IA", batch_size=1, delete_delay=360,
+        now=NOW, sleep=_sleep
+    )
+
+    assert moved == 2
+    assert waits == [360]
+    for file_id in (never_read, read_long_ago):
+        row = db.get(models.FileMetadata, file_id)
+        assert row.storage_tier == "cold"
+        assert row.s3_key.startswith("archive/uploads/p1/")
+        head = s3.head_object(Bucket=BUCKET, Key=row.s3_key)
+        assert head["StorageClass"] == "STANDARD_IA"
+        old_key = row.s3_key[len("archive/"):]
+        with pytest.raises(s3.exceptions.ClientError):
+            s3.head_object(Bucket=BUCKET, Key=old_key)
+
+    for file_id in (read_recently, new_upload):
+        row = db.get(models.FileMetadata, file_id)
+        assert row.storage_tier == "hot"
+        assert row.s3_key.startswith("uploads/")
+        s3.head_object(Bucket=BUCKET, Key=row.s3_key)
+
+
+def test_failed_copy_leaves_file_hot(db, s3):
+    file_id = _add_file(db, s3, "uploads/p1/gone.rvt", NOW - timedelta(days=200))
+    s3.delete_object(Bucket=BUCKET, Key="uploads/p1/gone.rvt")
+
+    moved = lifecycle.run_lifecycle(
+        db, s3, bucket=BUCKET, cold_after_days=90, now=NOW, sleep=lambda s: None
+    )
+
+    assert moved == 0
+    row = db.get(models.FileMetadata, file_id)
+    assert row.storage_tier == "hot"
+    assert row.s3_key == "uploads/p1/gone.rvt"
+
+
+def test_only_service_uploads_are_archived(db, s3):
+    s3.create_bucket(
+        Bucket="customer-bucket",
+        CreateBucketConfiguration={"LocationConstraint": "us-west-2"}
+    )
+    old = NOW - timedelta(days=200)
+    customer = _add_file(db, s3, "uploads/p1/theirs.rvt", old, bucket="customer-bucket")
+    imported = _add_file(db, s3, "projects/p1/imported.dwg", old)
+
+    moved = lifecycle.run_lifecycle(
+        db, s3, bucket=BUCKET, cold_after_days=90, now=NOW, sleep=lambda s: None
+    )
+
+    assert moved == 0
+    for file_id in (customer, imported):
+        assert db.get(models.FileMetadata, file_id).storage_tier == "hot"
@@ -0,0 +1,36 @@
+import os
+import sqlite3
+
+import pytest
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, inspect
+
+from app.config import settings
+
+SERVICE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+INIT_DB_SQL = os.path.join(
+    SERVICE_DIR, "..", "..", "infrastructure", "docker-compose", "init-db.sql"
+)
+
+
+def _upgrade(monkeypatch, url):
+    monkeypatch.setattr(settings, "DATABASE_URL", url)
+    command.upgrade(Config(os.path.join(SERVICE_DIR, "alembic.ini")), "head")
+
+
+@pytest.mark.parametrize("bootstrap", ["empty", "init-db.sql"])
+def test_upgrade_to_head(monkeypatch, tmp_path, bootstrap):
+    db_path = tmp_path / "migrate.db"
+    if bootstrap == "init-db.sql":
+        with open(INIT_DB_SQL) as f, sqlite3.connect(db_path) as conn:
+            conn.executescript(f.read())
+
+    url = f"sqlite:///{db_path}"
+    _upgrade(monkeypatch, url)
+
+    inspector = inspect(create_engine(url))
+    columns = {c["name"] for c in inspector.get_columns("file_metadata")}
+    assert {"access_count", "last_accessed_at", "storage_tier"} <= columns
+    for table in ("upload_sessions", "upload_parts", "bulk_import_checkpoints"):
+        assert inspector.has_table(table)
@@ -0,0 +1,207 @@
+import importlib
+from datetime import datetime
+
+import boto3
+import pytest
+from fastapi.testclient import TestClient
+from moto import mock_aws
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app import api_cache, models, upload_reaper
+from app.config import settings
+from app.database import Base
+
+BUCKET = "test-bucket"
+CHUNK = 5 * 1024 * 1024  # S3 minimum part size
+
+
+@pytest.fixture
+def env(monkeypatch):
+    main = importlib.import_module("app.main")
+    engine = create_engine(
+        "sqlite+pysqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+
+    def _get_db():
+        db = Session()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    with mock_aws():
+        s3 = boto3.client("s3", region_name="us-west-2")
+        s3.create_bucket(
+            Bucket=BUCKET,
+            CreateBucketConfiguration={"LocationConstraint": "us-west-2"}
+        )
+        monkeypatch.setattr(main, "s3_client", s3)
+        monkeypatch.setattr(settings, "S3_BUCKET_NAME", BUCKET)
+        monkeypatch.setattr(settings, "UPLOAD_CHUNK_SIZE", CHUNK)
+        main.app.dependency_overrides[main.get_db] = _get_db
+        try:
+            yield TestClient(main.app), s3, Session
+        finally:
+            main.app.dependency_overrides.clear()
+
+
+def _create(client, size, filename="federated.nwd"):
+    resp = client.post(
+        "/api/v1/uploads",
+        json={"filename": filename, "file_size": size, "project_id": "p1"}
+    )
+    assert resp.status_code == 201, resp.text
+    return resp.json()
+
+
+def test_resume_sends_only_missing_parts(env):
+    client, s3, Session = env
+    data = bytes(range(256)) * ((2 * CHUNK + 1000) // 256 + 1)
+    data = data[:2 * CHUNK + 1000]
+    upload = _create(client, len(data))
+    assert upload["total_parts"] == 3
+    assert upload["missing_parts"] == [1, 2, 3]
+
+    def chunk(n):
+        return data[(n - 1) * CHUNK:n * CHUNK]
+
+    # Parts 1 and 3 arrive, part 2 is "dropped"
+    for n in (3, 1):
+        resp = client.put(f"/api/v1/uploads/{upload['upload_id']}/parts/{n}", content=chunk(n))
+        assert resp.status_code == 200, resp.text
+
+    state = client.get(f"/api/v1/uploads/{upload['upload_id']}").json()
+    assert state["received_parts"] == [1, 3]
+    assert state["missing_parts"] == [2]
+
+    resp = client.post(f"/api/v1/uploads/{upload['upload_id']}/complete")
+    assert resp.status_code == 409
+
+    # Resume: only the missing part is sent; a retried part is harmless
+    for n in state["missing_parts"] + [1]:
+        resp = client.put(f"/api/v1/uploads/{upload['upload_id']}/parts/{n}", content=chunk(n))
+        assert resp.status_code == 200, resp.text
+
+    resp = client.post(f"/api/v1/uploads/{upload['upload_id']}/complete")
+    assert resp.status_code == 200, resp.text
+    result = resp.json()
+    assert result["file_size"] == len(data)
+
+    body = s3.get_object(Bucket=BUCKET, Key=result["s3_key"])["Body"].read()
+    assert body == data
+
+    db = Session()
+    assert db.get(models.FileMetadata, result["id"]).s3_key == result["s3_key"]
+    db.close()
+
+    # Completing again is idempotent
+    again = client.post(f"/api/v1/uploads/{upload['upload_id']}/complete")
+    assert again.json()["id"] == result["id"]
+
+
+def test_wrong_part_size_rejected(env):
+    client, _, _ = env
+    upload = _create(client, CHUNK + 10)
+    resp = client.put(f"/api/v1/uploads/{upload['upload_id']}/parts/1", content=b"x" * 10)
+    assert resp.status_code == 400
+    resp = client.put(f"/api/v1/uploads/{upload['upload_id']}/parts/3", content=b"x" * 10)
+    assert resp.status_code == 400
+
+
+def test_unsupported_extension_rejected(env):
+    client, _, _ = env
+    resp = client.post("/api/v1/uploads", json={"filename": "x.exe", "file_size": 10})
+    assert resp.status_code == 400
+
+
+def test_abort_releases_upload(env):
+    client, s3, _ = env
+    upload = _create(client, 10, filename="small.ifc")
+    resp = client.put(f"/api/v1/uploads/{upload['upload_id']}/parts/1", content=b"0123456789")
+    assert resp.status_code == 200
+
+    assert client.delete(f"/api/v1/uploads/{upload['upload_id']}").status_code == 204
+    assert client.get(f"/api/v1/uploads/{upload['upload_id']}").json()["status"] == "aborted"
+    assert s3.list_multipart_uploads(Bucket=BUCKET).get("Uploads", []) == []
+    resp = client.put(f"/api/v1/uploads/{upload['upload_id']}/parts/1", content=b"0123456789")
+    assert resp.status_code == 409
+
+
+def test_part_for_upload_ended_in_s3_conflicts(env, monkeypatch):
+    client, s3, _ = env
+    main = importlib.import_module("app.main")
+    upload = _create(client, 10, filename="small.ifc")
+
+    class _EndedUploadS3:
+        """Upload aborted (e.g. by the reaper) after the status check"""
+
+        exceptions = s3.exceptions
+
+        def upload_part(self, **kwargs):
+            raise s3.exceptions.NoSuchUpload(
+                {"Error": {"Code": "NoSuchUpload", "Message": "gone"}}, "UploadPart"
+            )
+
+    monkeypatch.setattr(main, "s3_client", _EndedUploadS3())
+    resp = client.put(f"/api/v1/uploads/{upload['upload_id']}/parts/1", content=b"0123456789")
+    assert resp.status_code == 409
+    assert client.get(f"/api/v1/uploads/{upload['upload_id']}").json()["received_parts"] == []
+
+
+def test_failed_insert_aborts_multipart_upload(env, monkeypatch):
+    client, s3, Session = env
+    main = importlib.import_module("app.main")
+
+    def _failing_db():
+        db = Session()
+
+        def _commit():
+            raise RuntimeError("db down")
+
+        db.commit = _commit
+        try:
+            yield db
+        finally:
+            db.close()
+
+    main.app.dependency_overrides[main.get_db] = _failing_db
+    resp = client.post("/api/v1/uploads", json={"filename": "a.rvt", "file_size": 10})
+
+    assert resp.status_code == 500
+    assert s3.list_multipart_uploads(Bucket=BUCKET).get("Uploads", []) == []
+
+
+def test_reaper_expires_stale_uploads(env):
+    client, s3, Session = env
+    stale = _create(client, 10, filename="stale.ifc")
+    fresh = _create(client, 10, filename="fresh.ifc")
+    resp = client.put(f"/api/v1/uploads/{stale['upload_id']}/parts/1", content=b"0123456789")
+    assert resp.status_code == 200
+
+    db = Session()
+    db.get(models.UploadSession, stale["upload_id"]).created_at = datetime(2020, 1, 1)
+    db.commit()
+    assert upload_reaper.reap_stale_uploads(db, s3, ttl_hours=72) == 1
+    db.close()
+
+    assert client.get(f"/api/v1/uploads/{stale['upload_id']}").json()["status"] == "expired"
+    assert client.get(f"/api/v1/uploads/{fresh['upload_id']}").json()["status"] == "pending"
+    remaining = [u["UploadId"] for u in s3.list_multipart_uploads(Bucket=BUCKET)["Uploads"]]
+    assert len(remaining) == 1
+
+
+def test_completed_file_id_is_published(env, fake_redis):
+    client, _, _ = env
+    upload = _create(client, 10, filename="small.ifc")
+    client.put(f"/api/v1/uploads/{upload['upload_id']}/parts/1", content=b"0123456789")
+
+    file_id = client.post(f"/api/v1/uploads/{upload['upload_id']}/complete").json()["id"]
+
+    assert fake_redis.zsets[api_cache.FILE_ID_HIGH_WATER_KEY] == {"max": file_id}
+    assert fake_redis.deleted == [api_cache.not_found_key(file_id)]
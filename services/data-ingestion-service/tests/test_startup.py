@@ -0,0 +1,91 @@
+import json
+import os
+import subprocess
+import sys
+import time
+
+import boto3
+from moto.server import ThreadedMotoServer
+
+# Cold-start budget for a pod: interpreter start + import of app.main, and
+# the time from app start-up (building the DB engine and S3 client) to the
+# first successful /ready.
+IMPORT_BUDGET_SECONDS = float(os.getenv("IMPORT_BUDGET_SECONDS", "3.0"))
+READY_BUDGET_SECONDS = float(os.getenv("READY_BUDGET_SECONDS", "1.0"))
+
+SERVICE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _test_env(monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", "sqlite+pysqlite:///:memory:")
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "test")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "test")
+    monkeypatch.setenv("AWS_REGION", "us-west-2")
+    monkeypatch.setenv("S3_BUCKET_NAME", "test-bucket")
+
+
+def test_import_is_lazy_and_within_budget(monkeypatch):
+    _test_env(monkeypatch)
+    probe = (
+        "import json, sys\n"
+        "import app.main as main\n"
+        "from app import database\n"
+        "print(json.dumps({\n"
+        "    'boto3': 'boto3' in sys.modules,\n"
+        "    's3_client': main.s3_client is not None,\n"
+        "    'engine': database.engine is not None,\n"
+        "}))\n"
+    )
+    env = dict(os.environ, PYTHONPATH=SERVICE_DIR)
+    start = time.perf_counter()
+    out = subprocess.run(
+        [sys.executable, "-c", probe],
+        cwd=SERVICE_DIR, env=env, capture_output=True, text=True, check=True,
+    )
+    elapsed = time.perf_counter() - start
+
+    state = json.loads(out.stdout.strip().splitlines()[-1])
+    assert state == {"boto3": False, "s3_client": False, "engine": False}
+    assert elapsed < IMPORT_BUDGET_SECONDS, f"import took {elapsed:.2f}s"
+
+
+def test_time_to_ready_within_budget(monkeypatch):
+    _test_env(monkeypatch)
+    # S3 is a moto server in this process; the app runs in a fresh
+    # interpreter that has not imported boto3, so the measurement includes
+    # the real boto3 import and client build done by the lifespan handler.
+    server = ThreadedMotoServer(ip_address="127.0.0.1", port=0)
+    server.start()
+    try:
+        host, port = server.get_host_and_port()
+        endpoint = f"http://{host}:{port}"
+        boto3.client("s3", region_name="us-west-2", endpoint_url=endpoint).create_bucket(
+            Bucket="test-bucket",
+            CreateBucketConfiguration={"LocationConstraint": "us-west-2"}
+        )
+        probe = (
+            "import json, sys, time\n"
+            "import app.main as main\n"
+            "from fastapi.testclient import TestClient\n"
+            "boto3_preloaded = 'boto3' in sys.modules\n"
+            "start = time.perf_counter()\n"
+            "with TestClient(main.app) as client:\n"
+            "    resp = client.get('/ready')\n"
+            "print(json.dumps({\n"
+            "    'elapsed': time.perf_counter() - start,\n"
+            "    'boto3_preloaded': boto3_preloaded,\n"
+            "    'status': resp.status_code,\n"
+            "}))\n"
+        )
+        env = dict(os.environ, PYTHONPATH=SERVICE_DIR, AWS_ENDPOINT_URL_S3=endpoint)
+        out = subprocess.run(
+            [sys.executable, "-c", probe],
+            cwd=SERVICE_DIR, env=env, capture_output=True, text=True, check=True,
+        )
+    finally:
+        server.stop()
+
+    result = json.loads(out.stdout.strip().splitlines()[-1])
+    assert not result["boto3_preloaded"]
+    assert result["status"] == 200
+    assert result["elapsed"] < READY_BUDGET_SECONDS, f"ready took {result['elapsed']:.2f}s"